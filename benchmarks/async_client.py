@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Async client check
+Drives AsyncLeetCodeAPI against the mock LeetCode GraphQL server: full and
+since_id listings, a batched detail lookup with a bad id, and a listing under
+injected 429s and 503s. Reports submissions/sec and fails on a wrong result.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+from mock_server import MockAccount, MockServer, account_from_arguments, add_account_arguments
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Faults of the "faults" scenario when none are given on the command line
+FAULT_RATE_429 = 0.05
+FAULT_FAILURE_RATE = 0.02
+
+
+def accepted_ids(account: MockAccount, since_id: int = None) -> list:
+    """Ids of the accepted submissions the mock account lists, newest first"""
+    return [
+        str(submission_id) for submission_id in range(account.submissions, 0, -1)
+        if (since_id is None or submission_id > since_id)
+        and account.submission(submission_id)["statusDisplay"] == "Accepted"
+    ]
+
+
+def create_client(url: str, args: argparse.Namespace):
+    from commands.async_api import AsyncLeetCodeAPI
+    from commands.rate_limit import TokenBucket
+    from commands.retry import RetryPolicy
+
+    # Throughput is bounded by the mock, not by LeetCode's request budget
+    return AsyncLeetCodeAPI("benchmark", limiter=TokenBucket(args.rate, args.burst),
+                            concurrency=args.concurrency, batch_size=args.batch_size,
+                            retry_policy=RetryPolicy(base_delay=0.05, max_delay=1.0),
+                            base_url=url)
+
+
+async def check_listing(url: str, args: argparse.Namespace, account: MockAccount, since_id: int = None) -> tuple:
+    """List every accepted submission after since_id; returns (submissions received, problems found)"""
+    problems = []
+    async with create_client(url, args) as api:
+        received = [submission async for submission in api.fetch_all_accepted_submissions(since_id=since_id)]
+
+    expected = accepted_ids(account, since_id)
+    received_ids = [submission["id"] for submission in received]
+    if received_ids != expected:
+        problems.append(f"listed {len(received_ids)} submissions, expected {len(expected)} in order")
+    without_code = [submission["id"] for submission in received if not submission.get("code")]
+    if without_code:
+        problems.append(f"{len(without_code)} submissions came back without code")
+    if api.head_submission is None or api.head_submission["id"] != account.submissions:
+        problems.append(f"head submission is {api.head_submission}, expected #{account.submissions}")
+    return len(received), problems
+
+
+async def check_batch(url: str, args: argparse.Namespace, account: MockAccount) -> tuple:
+    """Look up two real ids and a missing one in a single batch; returns (ids looked up, problems found)"""
+    problems = []
+    submission_ids = ["1", str(account.submissions), str(account.submissions + 1000)]
+    async with create_client(url, args) as api:
+        results = await api.get_submission_details_batch(submission_ids)
+
+    for submission_id in submission_ids[:2]:
+        if not isinstance(results.get(submission_id), dict) or not results[submission_id].get("code"):
+            problems.append(f"batch lookup of #{submission_id} returned {results.get(submission_id)!r}")
+    if not isinstance(results.get(submission_ids[2]), Exception):
+        problems.append(f"batch lookup of missing #{submission_ids[2]} did not fail on its own")
+    return len(submission_ids), problems
+
+
+def run_scenario(name: str, account: MockAccount, args: argparse.Namespace, check) -> bool:
+    with MockServer(account) as server:
+        start = time.perf_counter()
+        count, problems = asyncio.run(check(server.url, args, account))
+        elapsed = time.perf_counter() - start
+        stats = dict(account.stats)
+
+    print(f"{name:<12} {elapsed:>7.2f}s {count / max(elapsed, 1e-9):>9.0f}/s {stats['requests']:>9} "
+          f"{stats['throttled']:>6} {stats['failed']:>6}")
+    for problem in problems:
+        print(f"  ❌ {problem}")
+    return not problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the asyncio LeetCode client against the mock API")
+    parser.add_argument("--submissions", type=int, default=1000, help="submissions in the account")
+    parser.add_argument("--concurrency", type=int, default=16, help="in-flight requests per client")
+    parser.add_argument("--batch-size", type=int, default=10, help="submission details per request")
+    parser.add_argument("--rate", type=float, default=1000.0, help="client requests per second")
+    parser.add_argument("--burst", type=int, default=100, help="client requests sent back-to-back")
+    add_account_arguments(parser)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(PROJECT_ROOT))
+    # Retries are expected under injected faults; only wrong results are reported
+    logging.getLogger().setLevel(logging.ERROR)
+    from commands import async_api
+    if async_api.aiohttp is None:
+        print("❌ The async client needs aiohttp: pip install aiohttp")
+        sys.exit(1)
+
+    since_id = args.submissions // 2
+
+    def faulty_account():
+        account = account_from_arguments(args, args.submissions)
+        account.rate_429 = args.rate_429 or FAULT_RATE_429
+        account.failure_rate = args.failure_rate or FAULT_FAILURE_RATE
+        return account
+
+    scenarios = [
+        ("full", account_from_arguments(args, args.submissions), check_listing),
+        ("since_id", account_from_arguments(args, args.submissions),
+         lambda url, options, account: check_listing(url, options, account, since_id)),
+        ("batch", account_from_arguments(args, args.submissions), check_batch),
+        ("faults", faulty_account(), check_listing),
+    ]
+
+    print(f"{'scenario':<12} {'time':>8} {'subs/sec':>10} {'requests':>9} {'429s':>6} {'503s':>6}")
+    results = [run_scenario(name, account, args, check) for name, account, check in scenarios]
+
+    print()
+    if not all(results):
+        print("❌ The async client returned wrong results")
+        sys.exit(1)
+    print("✅ The async client listed and looked up every submission correctly")
+
+
+if __name__ == "__main__":
+    main()
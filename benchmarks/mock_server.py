@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Mock LeetCode GraphQL server
+Serves synthetic submissionList, submissionDetails (single and batched) and
+questionList responses for an account of any size, with injectable latency,
+429s and failures, so fetch can be benchmarked without leetcode.com
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Distinct problems the synthetic account has solved
+DEFAULT_PROBLEMS = 3000
+
+# golang is not a supported language, so some submissions are filtered out like in real accounts
+LANGUAGES = ["python3", "java", "cpp", "javascript", "c", "golang"]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+# Rough size of the fields real responses carry
+CODE_LINES = 30
+DISTRIBUTION_BYTES = 3000
+
+FIRST_TIMESTAMP = 1600000000
+
+# Built once; every detail response carries a copy
+DISTRIBUTION = json.dumps({"distribution": [[str(i), 0.1] for i in range(DISTRIBUTION_BYTES // 16)]})
+
+ALIAS_PATTERN = re.compile(r"(\w+)\s*:\s*submissionDetails\(submissionId:\s*\$(\w+)\)")
+
+
+class MockAccount:
+    """
+    Synthetic account and fault injection settings
+
+    Submission ids run from 1 (oldest) to `submissions` (newest); two out
+    of three are accepted. grow() adds newer submissions, like solving
+    more problems between two syncs.
+    """
+
+    def __init__(self, submissions: int, problems: int = DEFAULT_PROBLEMS, latency: float = 0.0,
+                 jitter: float = 0.0, rate_429: float = 0.0, failure_rate: float = 0.0,
+                 retry_after: float = 0.1, seed: int = 0):
+        self.submissions = submissions
+        self.problems = max(1, problems)
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.failure_rate = failure_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.stats = {"requests": 0, "list": 0, "details": 0, "problem_list": 0,
+                      "throttled": 0, "failed": 0, "bytes_sent": 0}
+        self._lock = threading.Lock()
+
+    def grow(self, count: int):
+        with self._lock:
+            self.submissions += count
+
+    def count(self, stat: str, amount: int = 1):
+        with self._lock:
+            self.stats[stat] += amount
+
+    def roll(self, probability: float) -> bool:
+        with self._lock:
+            return self.random.random() < probability
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.latency + self.random.uniform(0, self.jitter)
+
+    def problem(self, submission_id: int) -> int:
+        return submission_id * 7 % self.problems + 1
+
+    def submission(self, submission_id: int) -> dict:
+        problem = self.problem(submission_id)
+        accepted = submission_id % 3 != 0
+        return {
+            "id": str(submission_id),
+            "title": f"Problem {problem}",
+            "titleSlug": f"problem-{problem}",
+            "status": 10 if accepted else 11,
+            "statusDisplay": "Accepted" if accepted else "Wrong Answer",
+            # Languages rotate once per pass over the problems, so each problem gets several
+            "lang": LANGUAGES[(submission_id + submission_id // self.problems) % len(LANGUAGES)],
+            "runtime": f"{submission_id % 100} ms",
+            "timestamp": str(FIRST_TIMESTAMP + submission_id * 60),
+            "url": f"/submissions/detail/{submission_id}/",
+            "isPending": "Not Pending",
+            "memory": "16.4 MB",
+            "__typename": "SubmissionDumpNode",
+        }
+
+    def details(self, submission_id: int) -> dict:
+        submission = self.submission(submission_id)
+        problem = self.problem(submission_id)
+        code = "\n".join(f"    line_{line} = {submission_id} * {line}  # solution body" for line in range(CODE_LINES))
+        return {
+            "runtime": submission_id % 100,
+            "runtimeDisplay": submission["runtime"],
+            "runtimePercentile": 87.5,
+            "runtimeDistribution": DISTRIBUTION,
+            "memory": 16400,
+            "memoryDisplay": submission["memory"],
+            "memoryPercentile": 45.2,
+            "memoryDistribution": DISTRIBUTION,
+            "code": f"class Solution:\n    def solve(self):\n{code}\n",
+            "timestamp": int(submission["timestamp"]),
+            "statusCode": submission["status"],
+            "user": {"username": "bench", "profile": {"realName": "Bench User", "userAvatar": "https://example.com/a.png"}},
+            "lang": {"name": submission["lang"], "verboseName": submission["lang"]},
+            "question": {"questionId": str(problem), "titleSlug": submission["titleSlug"],
+                         "title": submission["title"], "translatedTitle": None,
+                         "difficulty": DIFFICULTIES[problem % 3]},
+            "notes": "",
+            "flagType": "WHITE",
+            "topicTags": [{"name": "Array", "slug": "array"}, {"name": "Hash Table", "slug": "hash-table"}],
+            "runtimeError": None,
+            "compileError": None,
+            "lastTestcase": "[1,2,3]\n4",
+        }
+
+    def submission_list(self, offset: int, limit: int) -> dict:
+        with self._lock:
+            newest = self.submissions
+        ids = range(newest - offset, max(newest - offset - limit, 0), -1)
+        return {
+            "lastKey": f"key-{offset + limit}",
+            "hasNext": newest - offset - limit > 0,
+            "submissions": [self.submission(submission_id) for submission_id in ids],
+        }
+
+    def problem_list(self, skip: int, limit: int) -> dict:
+        questions = [
+            {"questionId": str(problem), "questionFrontendId": str(problem), "title": f"Problem {problem}",
+             "titleSlug": f"problem-{problem}", "difficulty": DIFFICULTIES[problem % 3],
+             "topicTags": [{"name": "Array", "slug": "array"}]}
+            for problem in range(skip + 1, min(self.problems, skip + limit) + 1)
+        ]
+        return {"total": self.problems, "questions": questions}
+
+
+def requested_fields(query: str, details: dict) -> set:
+    """Top-level detail fields a query asks for, so responses shrink like a real GraphQL server's"""
+    return {field for field in details if re.search(rf"\b{field}\b", query)}
+
+
+def handle_graphql(account: MockAccount, body: dict) -> dict:
+    """Answer one GraphQL request body"""
+    query, variables = body.get("query", ""), body.get("variables") or {}
+
+    if "submissionList" in query:
+        account.count("list")
+        return {"data": {"submissionList": account.submission_list(variables["offset"], variables["limit"])}}
+
+    if "questionList" in query:
+        account.count("problem_list")
+        return {"data": {"problemsetQuestionList": account.problem_list(variables["skip"], variables["limit"])}}
+
+    data, errors, fields = {}, [], None
+    for alias, variable in ALIAS_PATTERN.findall(query) or [("submissionDetails", "submissionId")]:
+        account.count("details")
+        submission_id = int(variables.get(variable, 0))
+        if 1 <= submission_id <= account.submissions:
+            details = account.details(submission_id)
+            if fields is None:
+                fields = requested_fields(query, details)
+            data[alias] = {field: value for field, value in details.items() if field in fields}
+        else:
+            data[alias] = None
+            errors.append({"message": "Submission not found", "path": [alias]})
+
+    response = {"data": data}
+    if errors:
+        response["errors"] = errors
+    return response
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment; separate small writes stall on delayed ACKs
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload=None, headers: dict = None):
+        raw = json.dumps(payload).encode('utf-8') if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+        self.server.account.count("bytes_sent", len(raw))
+
+    def do_GET(self):
+        # Request counters, for checking what a scenario cost
+        self._send(200, self.server.account.stats)
+
+    def do_POST(self):
+        account = self.server.account
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+
+        if self.path == "/control":
+            account.grow(int(body.get("grow", 0)))
+            self._send(200, {"submissions": account.submissions})
+            return
+
+        account.count("requests")
+        delay = account.delay()
+        if delay:
+            time.sleep(delay)
+
+        if account.roll(account.rate_429):
+            account.count("throttled")
+            self._send(429, headers={"Retry-After": str(account.retry_after)})
+        elif account.roll(account.failure_rate):
+            account.count("failed")
+            self._send(503)
+        else:
+            self._send(200, handle_graphql(account, body))
+
+
+class MockServer:
+    """Runs a mock GraphQL server on a background thread; use as a context manager"""
+
+    def __init__(self, account: MockAccount, port: int = 0):
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), MockHandler)
+        self.server.daemon_threads = True
+        self.server.account = account
+        self.account = account
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-leetcode", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/graphql"
+
+    @property
+    def control_url(self) -> str:
+        return self.url.replace("/graphql", "/control")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def add_account_arguments(parser: argparse.ArgumentParser):
+    """Options describing the synthetic account and its faults, shared with the benchmark runner"""
+    parser.add_argument("--problems", type=int, default=DEFAULT_PROBLEMS, help="distinct problems solved")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra latency per request, up to this much")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered with HTTP 429")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 503")
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=0, help="seed for latency jitter and fault injection")
+
+
+def account_from_arguments(args: argparse.Namespace, submissions: int) -> MockAccount:
+    return MockAccount(submissions, problems=args.problems, latency=args.latency_ms / 1000,
+                       jitter=args.jitter_ms / 1000, rate_429=args.rate_429,
+                       failure_rate=args.failure_rate, retry_after=args.retry_after, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic LeetCode GraphQL API")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--submissions", type=int, default=1000, help="submissions in the account")
+    add_account_arguments(parser)
+    args = parser.parse_args()
+
+    with MockServer(account_from_arguments(args, args.submissions), args.port) as server:
+        print(f"Mock LeetCode API on {server.url} ({args.submissions} submissions); Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark
+Measures the import cost of every lcsync command with `python -X importtime`
+and fails if a command goes over its budget or imports a module it must not
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules each lcsync command imports before doing any work
+COMMAND_MODULES = {
+    "help": [],
+    "init": ["leetcode_auto_push", "commands.init"],
+    "user": ["leetcode_auto_push", "commands.set_user"],
+    "cookie": ["leetcode_auto_push", "commands.set_cookie"],
+    "fetch": ["leetcode_auto_push", "commands.fetch"],
+    "render": ["leetcode_auto_push", "commands.render"],
+    "push": ["leetcode_auto_push", "commands.git_push"],
+    "watch": ["leetcode_auto_push", "commands.watch"],
+}
+
+# Import time budget per command in milliseconds, on top of a bare interpreter
+IMPORT_BUDGETS_MS = {
+    "help": 10,
+    "init": 80,
+    "user": 80,
+    "cookie": 80,
+    "fetch": 300,
+    "render": 100,
+    "push": 100,
+    "watch": 300,
+}
+
+# Heavy modules that only some commands need
+FORBIDDEN_MODULES = {
+    "help": {"click", "requests", "asyncio", "aiohttp", "sqlite3"},
+    "init": {"requests", "asyncio", "aiohttp", "sqlite3"},
+    "user": {"requests", "asyncio", "aiohttp", "sqlite3"},
+    "cookie": {"requests", "asyncio", "aiohttp", "sqlite3"},
+    "fetch": {"asyncio", "aiohttp"},
+    "render": {"requests", "asyncio", "aiohttp"},
+    "push": {"requests", "asyncio", "aiohttp", "sqlite3"},
+    "watch": {"asyncio", "aiohttp"},
+}
+
+
+def build_snippet(modules):
+    """Python code importing lcsync and the given modules from the project root"""
+    imports = "".join(f"; import {module}" for module in ["lcsync"] + modules)
+    return f"import sys; sys.path.insert(0, {str(PROJECT_ROOT)!r}){imports}"
+
+
+def measure_imports(snippet):
+    """
+    Run a snippet under -X importtime
+    Returns (total import time in microseconds, set of imported module names)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", snippet],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=PROJECT_ROOT
+    )
+
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        modules.add(name.strip())
+    return total_us, modules
+
+
+def measure_wall_clock(snippet, runs):
+    """Median wall-clock seconds to start the interpreter and run a snippet"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", snippet], check=True, cwd=PROJECT_ROOT)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure lcsync command startup time")
+    parser.add_argument("commands", nargs="*", default=list(COMMAND_MODULES),
+                        help="commands to measure (default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="runs per command (median is reported)")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="multiply every budget, e.g. 2 on slow CI machines")
+    args = parser.parse_args()
+
+    baseline_runs = [measure_imports("pass")[0] for _ in range(args.runs)]
+    baseline_us = statistics.median(baseline_runs)
+    baseline_wall = measure_wall_clock("pass", args.runs)
+
+    failures = []
+    print(f"{'command':<8} {'imports':>10} {'budget':>8} {'wall':>9}")
+
+    for command in args.commands:
+        if command not in COMMAND_MODULES:
+            parser.error(f"unknown command: {command}")
+
+        snippet = build_snippet(COMMAND_MODULES[command])
+        runs = [measure_imports(snippet) for _ in range(args.runs)]
+        import_ms = max(0.0, statistics.median(total for total, _ in runs) - baseline_us) / 1000
+        imported = set().union(*(modules for _, modules in runs))
+        wall_ms = max(0.0, measure_wall_clock(snippet, args.runs) - baseline_wall) * 1000
+        budget_ms = IMPORT_BUDGETS_MS[command] * args.scale
+
+        print(f"{command:<8} {import_ms:>8.1f}ms {budget_ms:>6.0f}ms {wall_ms:>7.1f}ms")
+
+        if import_ms > budget_ms:
+            failures.append(f"{command}: imports take {import_ms:.1f}ms, budget is {budget_ms:.0f}ms")
+        leaked = sorted(FORBIDDEN_MODULES[command] & imported)
+        if leaked:
+            failures.append(f"{command}: imports {', '.join(leaked)}")
+
+    if failures:
+        print()
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+
+    print()
+    print("✅ All commands within their startup budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Sync benchmark
+Runs fetch and push scenarios against the mock LeetCode GraphQL server for
+accounts of several sizes and reports submissions/sec, bytes downloaded and peak RSS.
+With --baseline, fails if throughput dropped or memory grew past --tolerance.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from mock_server import MockServer, account_from_arguments, add_account_arguments
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+BENCH_USER = "bench"
+
+# Scenario -> (setup steps, measured step); every step runs in its own process
+SCENARIOS = {
+    "full": ([], "full"),
+    "incremental": (["full"], "incremental"),
+    "push": (["full"], "push"),
+    "backfill": ([], "backfill"),
+}
+
+DEFAULT_SIZES = [100, 1000]
+
+
+def git(*args, cwd=None):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def create_environment(root: Path) -> Path:
+    """
+    Create a workspace (users/ and cache/) and a solutions repository with a
+    bare remote to push to. Returns the workspace directory.
+    """
+    workspace, repo, remote = root / "workspace", root / "solutions", root / "remote.git"
+    (workspace / "users").mkdir(parents=True)
+    git("init", "-q", "--bare", str(remote))
+    git("init", "-q", str(repo))
+    git("config", "user.name", "Benchmark", cwd=repo)
+    git("config", "user.email", "bench@example.com", cwd=repo)
+    (repo / "README.md").write_text("Benchmark solutions\n", encoding='utf-8')
+    git("add", "README.md", cwd=repo)
+    git("commit", "-q", "-m", "Initial commit", cwd=repo)
+    git("remote", "add", "origin", str(remote), cwd=repo)
+    git("push", "-q", "-u", "origin", "HEAD", cwd=repo)
+
+    config = {"LEETCODE_COOKIE": "benchmark", "GITHUB_REPO_DIR": str(repo),
+              "GITHUB_COMMIT_MESSAGE": "Benchmark sync"}
+    (workspace / "users" / f"{BENCH_USER}.json").write_text(json.dumps(config), encoding='utf-8')
+    return workspace
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (None where unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_step(step: str, url: str, options: dict) -> dict:
+    """Run one step in this process (from inside the workspace) and measure it"""
+    sys.path.insert(0, str(PROJECT_ROOT))
+    from commands.fetch import LeetCodeAPI, fetch_submissions
+    from commands.git_push import git_push
+    from commands.manifest import read_pending_paths
+    from commands.metrics import METRICS
+    from commands.rate_limit import TokenBucket
+    from commands.set_user import get_user_config
+
+    _, config = get_user_config(BENCH_USER)
+    start = time.perf_counter()
+
+    # Keep the command output out of the benchmark report
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        if step == "push":
+            count = len(read_pending_paths(Path(config["GITHUB_REPO_DIR"])) or [])
+            git_push(username=BENCH_USER)
+        else:
+            api = LeetCodeAPI(config["LEETCODE_COOKIE"], limiter=TokenBucket(options["rate"], options["burst"]),
+                              workers=options["workers"], batch_size=options["batch_size"], base_url=url,
+                              detail_profile=options["fields"])
+            count = fetch_submissions(full=step != "incremental", on_duplicate="overwrite",
+                                      backfill=step == "backfill", username=BENCH_USER, api=api)
+
+    return {"seconds": time.perf_counter() - start, "count": count,
+            "listed": METRICS.total("submissions_listed_total"), "peak_rss_mb": peak_rss_mb()}
+
+
+def run_scenario(name: str, server: MockServer, args: argparse.Namespace) -> dict:
+    """Run a scenario's steps in fresh processes and return the measured step's results"""
+    setup_steps, measured_step = SCENARIOS[name]
+    options = {"workers": args.workers, "rate": args.rate, "burst": args.burst, "batch_size": args.batch_size,
+               "fields": args.fields}
+
+    with tempfile.TemporaryDirectory(prefix=f"lcsync-bench-{name}-") as root:
+        workspace = create_environment(Path(root))
+        submissions = server.account.submissions
+
+        for step in setup_steps + [measured_step]:
+            if step == measured_step and step == "incremental":
+                server.account.grow(args.new_submissions)
+            stats_before = dict(server.account.stats)
+
+            result = subprocess.run(
+                [sys.executable, str(Path(__file__).resolve()), "--step", step, "--url", server.url,
+                 "--options", json.dumps(options)],
+                cwd=workspace, capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"{name}: step {step} failed:\n{result.stderr.strip()}")
+
+        # Put the account back for the next scenario
+        server.account.submissions = submissions
+
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    measured["requests"] = server.account.stats["requests"] - stats_before["requests"]
+    measured["throttled"] = server.account.stats["throttled"] - stats_before["throttled"]
+    measured["failed"] = server.account.stats["failed"] - stats_before["failed"]
+    measured["bytes"] = server.account.stats["bytes_sent"] - stats_before["bytes_sent"]
+    measured["per_second"] = measured["count"] / max(measured["seconds"], 1e-9)
+    measured["listed_per_second"] = measured["listed"] / max(measured["seconds"], 1e-9)
+    return measured
+
+
+def compare_to_baseline(results: list, baseline_path: Path, tolerance: float) -> list:
+    """Regressions against a saved --json report: lower throughput or higher peak RSS"""
+    baseline = {(entry["scenario"], entry["submissions"]): entry
+                for entry in json.loads(baseline_path.read_text(encoding='utf-8'))["results"]}
+    failures = []
+
+    for entry in results:
+        before = baseline.get((entry["scenario"], entry["submissions"]))
+        if before is None:
+            continue
+        label = f"{entry['scenario']} @ {entry['submissions']}"
+        if entry["per_second"] < before["per_second"] * (1 - tolerance):
+            failures.append(f"{label}: {entry['per_second']:.0f}/s, baseline {before['per_second']:.0f}/s")
+        if entry["peak_rss_mb"] and before.get("peak_rss_mb") and \
+                entry["peak_rss_mb"] > before["peak_rss_mb"] * (1 + tolerance):
+            failures.append(f"{label}: peak RSS {entry['peak_rss_mb']:.0f} MB, baseline {before['peak_rss_mb']:.0f} MB")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark lcsync fetch and push against a mock LeetCode API")
+    parser.add_argument("scenarios", nargs="*", default=list(SCENARIOS),
+                        help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="account sizes in submissions, e.g. 100 1000 10000 50000")
+    parser.add_argument("--new-submissions", type=int, default=50,
+                        help="submissions added before the incremental sync")
+    parser.add_argument("--workers", type=int, default=4, help="fetch --workers")
+    parser.add_argument("--rate", type=float, default=1000.0, help="fetch --rate (high, so the limiter is not measured)")
+    parser.add_argument("--burst", type=int, default=50, help="fetch --burst")
+    parser.add_argument("--batch-size", type=int, default=10, help="fetch --batch-size")
+    parser.add_argument("--fields", choices=["minimal", "standard", "full"], default="standard",
+                        help="fetch --fields (submission detail field profile)")
+    add_account_arguments(parser)
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="fail on regressions against a previous --json file")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed throughput drop or RSS growth against the baseline")
+    parser.add_argument("--step", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--options", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.step:
+        print(json.dumps(run_step(args.step, args.url, json.loads(args.options))))
+        return
+
+    for scenario in args.scenarios:
+        if scenario not in SCENARIOS:
+            parser.error(f"unknown scenario: {scenario}")
+
+    results = []
+    print(f"{'scenario':<12} {'account':>8} {'listed':>7} {'synced':>7} {'seconds':>8} "
+          f"{'listed/s':>9} {'synced/s':>9} {'requests':>9} {'received':>9} {'peak RSS':>9}")
+
+    for size in args.sizes:
+        with MockServer(account_from_arguments(args, size)) as server:
+            for scenario in args.scenarios:
+                measured = run_scenario(scenario, server, args)
+                results.append({"scenario": scenario, "submissions": size, **measured})
+                rss = f"{measured['peak_rss_mb']:.0f} MB" if measured["peak_rss_mb"] else "n/a"
+                print(f"{scenario:<12} {size:>8} {measured['listed']:>7} {measured['count']:>7} "
+                      f"{measured['seconds']:>7.2f}s {measured['listed_per_second']:>9.0f} "
+                      f"{measured['per_second']:>9.0f} {measured['requests']:>9} "
+                      f"{measured['bytes'] / 1e6:>6.1f} MB {rss:>9}")
+
+    if args.json:
+        args.json.write_text(json.dumps({"created_at": time.time(), "results": results}, indent=2), encoding='utf-8')
+
+    if args.baseline:
+        failures = compare_to_baseline(results, args.baseline, args.tolerance)
+        if failures:
+            print()
+            for failure in failures:
+                print(f"❌ {failure}")
+            sys.exit(1)
+        print()
+        print("✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Async LeetCode API client
+asyncio-native counterpart of LeetCodeAPI for running syncs inside an event loop
+"""
+
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency - only needed for the async client
+    aiohttp = None
+
+from .defaults import DEFAULT_BATCH_SIZE, DEFAULT_BURST, DEFAULT_RATE, DEFAULT_READ_TIMEOUT
+from .queries import (DEFAULT_DETAIL_PROFILE, LEETCODE_GRAPHQL_URL,
+                      SUBMISSION_DETAIL_QUERY_TEMPLATE, SUBMISSION_LIST_QUERY,
+                      build_batch_detail_query, get_detail_fields,
+                      get_request_headers, merge_batch_results,
+                      merge_submission_details, split_batch_response)
+from .rate_limit import TokenBucket
+from .retry import (CircuitBreaker, FatalAPIError, RetryPolicy, TransientError,
+                    check_graphql_auth, check_status)
+from .sync_state import trim_synced_submissions
+
+# Maximum in-flight requests (and pooled connections) per client
+DEFAULT_CONCURRENCY = 16
+
+
+class AsyncLeetCodeAPI:
+    """
+    asyncio LeetCode API client for fetching submissions
+
+    Mirrors LeetCodeAPI, but every request is a coroutine sharing one
+    pooled aiohttp session. Use it as an async context manager so the
+    connections are closed:
+
+        async with AsyncLeetCodeAPI(cookie) as api:
+            async for submission in api.fetch_all_accepted_submissions():
+                ...
+
+    Cancelling the consuming task cancels every in-flight request.
+    """
+
+    def __init__(self, cookie: str, limiter: TokenBucket = None,
+                 concurrency: int = DEFAULT_CONCURRENCY, timeout: float = DEFAULT_READ_TIMEOUT,
+                 batch_size: int = DEFAULT_BATCH_SIZE, retry_policy: RetryPolicy = None,
+                 breaker: CircuitBreaker = None, base_url: str = LEETCODE_GRAPHQL_URL,
+                 detail_profile: str = DEFAULT_DETAIL_PROFILE):
+        if aiohttp is None:
+            raise ImportError("The async LeetCode client requires aiohttp. Install it with: pip install aiohttp")
+
+        self.cookie = cookie
+        self.base_url = base_url
+        self.limiter = limiter or TokenBucket(DEFAULT_RATE, DEFAULT_BURST)
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.batch_size = max(1, batch_size)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.detail_fields = get_detail_fields(True, detail_profile)
+        self.head_submission = None
+        self.last_key = None
+        self._session = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """Create the pooled HTTP session if it is not open yet"""
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            self._session = aiohttp.ClientSession(
+                headers=get_request_headers(self.cookie),
+                connector=connector
+            )
+
+    async def close(self):
+        """Close the HTTP session and its pooled connections"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _post(self, query: str, variables: Dict, timeout: float = None, require_data: bool = False) -> Dict:
+        """
+        Send a GraphQL request once the rate limiter allows it and return the raw response
+        Retried per self.retry_policy exactly like LeetCodeAPI._post
+        """
+        await self.open()
+
+        logger = logging.getLogger()
+        payload = {"query": query, "variables": variables}
+        request_timeout = aiohttp.ClientTimeout(
+            total=timeout or self.timeout,
+            connect=self.retry_policy.connect_timeout
+        )
+        max_attempts = self.retry_policy.max_attempts
+
+        for attempt in range(1, max_attempts + 1):
+            self.breaker.check()
+            await self.limiter.acquire_async()
+
+            try:
+                try:
+                    async with self._session.post(self.base_url, json=payload, timeout=request_timeout) as response:
+                        check_status(response.status, response.headers.get("Retry-After"))
+                        response.raise_for_status()
+                        data = await response.json(content_type=None)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    raise TransientError(f"{type(e).__name__}: {e}")
+                check_graphql_auth(data, require_data)
+            except TransientError as e:
+                if e.throttled:
+                    # Every request waits until LeetCode said to come back, through the limiter
+                    self.limiter.defer(min(e.retry_after, self.retry_policy.max_delay))
+                else:
+                    self.breaker.record_failure()
+                if attempt == max_attempts:
+                    raise
+
+                # Abort straight away instead of sleeping once the circuit has opened
+                self.breaker.check()
+
+                if e.throttled:
+                    logger.warning(f"Rate limited by LeetCode, retrying in {e.retry_after:.1f}s "
+                                   f"(attempt {attempt + 1}/{max_attempts})")
+                    continue
+
+                delay = self.retry_policy.compute_delay(attempt, e.retry_after)
+                logger.warning(f"API call failed ({e}), retrying in {delay:.1f}s (attempt {attempt + 1}/{max_attempts})")
+                await asyncio.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return data
+
+    async def _graphql(self, query: str, variables: Dict, timeout: float = None, require_data: bool = False) -> Dict:
+        """Send a GraphQL request and return its data, raising on any GraphQL error"""
+        data = await self._post(query, variables, timeout, require_data)
+        if "errors" in data:
+            raise Exception(f"GraphQL errors: {data['errors']}")
+
+        return data["data"]
+
+    async def get_submission_detail(self, submission_id: str, timeout: float = None) -> Dict:
+        """Get detailed submission info including code"""
+        variables = {"submissionId": int(submission_id)}
+        data = await self._graphql(SUBMISSION_DETAIL_QUERY_TEMPLATE % self.detail_fields, variables, timeout)
+        if data["submissionDetails"] is None:
+            raise Exception("no data returned")
+        return data["submissionDetails"]
+
+    async def get_submission_details_batch(self, submission_ids: List[str], timeout: float = None) -> Dict:
+        """
+        Get detailed info for many submissions in a single request
+        Returns a dict of submission id -> details, or the Exception raised
+        for that id when only part of the batch failed
+        """
+        query, variables, aliases = build_batch_detail_query(submission_ids, self.detail_fields)
+        response = await self._post(query, variables, timeout)
+        return split_batch_response(response, submission_ids, aliases)
+
+    async def fetch_submissions(self, offset: int = 0, limit: int = 50, last_key: str = None,
+                                timeout: float = None) -> Dict:
+        """Fetch one page of submissions from LeetCode GraphQL API"""
+        variables = {
+            "offset": offset,
+            "limit": limit,
+            "lastKey": last_key
+        }
+        data = await self._graphql(SUBMISSION_LIST_QUERY, variables, timeout, require_data=True)
+        return data["submissionList"]
+
+    async def _fetch_detail(self, submission: Dict, semaphore: asyncio.Semaphore) -> Dict:
+        """Fetch and merge the details of one submission, keeping the basic info on failure"""
+        logger = logging.getLogger()
+        submission_id = submission.get("id")
+
+        async with semaphore:
+            try:
+                logger.info(f"Fetching details for submission {submission_id}")
+                details = await self.get_submission_detail(submission_id)
+                return merge_submission_details(submission, details)
+            except FatalAPIError:
+                raise
+            except Exception as e:
+                # CancelledError is not an Exception, so cancellation still propagates
+                logger.warning(f"Failed to get details for submission {submission_id}: {e}")
+                return submission
+
+    async def _fetch_detail_batch(self, submissions: List[Dict], semaphore: asyncio.Semaphore) -> List[Dict]:
+        """Fetch and merge the details of a batch of submissions in one request"""
+        if len(submissions) == 1:
+            return [await self._fetch_detail(submissions[0], semaphore)]
+
+        logger = logging.getLogger()
+        submission_ids = [sub["id"] for sub in submissions]
+
+        async with semaphore:
+            try:
+                logger.info(f"Fetching details for {len(submission_ids)} submissions in one request")
+                results = await self.get_submission_details_batch(submission_ids)
+            except FatalAPIError:
+                raise
+            except Exception as e:
+                logger.warning(f"Failed to get details for submissions {', '.join(submission_ids)}: {e}")
+                return submissions
+
+        return merge_batch_results(submissions, results)
+
+    async def fetch_submission_details(self, submissions: List[Dict]) -> List[Dict]:
+        """
+        Fetch details for many submissions concurrently
+        Submissions are looked up self.batch_size per request with at most
+        self.concurrency requests in flight; results keep the input order
+        """
+        submissions = [sub for sub in submissions if sub.get("id")]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [
+            self._fetch_detail_batch(submissions[start:start + self.batch_size], semaphore)
+            for start in range(0, len(submissions), self.batch_size)
+        ]
+        results = await asyncio.gather(*tasks)
+        return [submission for batch in results for submission in batch]
+
+    async def fetch_all_accepted_submissions(self, since_id: int = None) -> AsyncIterator[Dict]:
+        """
+        Yield all accepted submissions (with details) page by page
+        Stops at the first submission with an id <= since_id, like
+        LeetCodeAPI.fetch_all_accepted_submissions
+        """
+        offset = 0
+        limit = 20
+        last_key = None
+
+        self.head_submission = None
+        self.last_key = None
+
+        logger = logging.getLogger()
+
+        while True:
+            logger.info(f"Fetching submissions: offset={offset}, limit={limit}")
+
+            # Retries, timeouts and auth failures are handled by the retry policy
+            result = await self.fetch_submissions(offset, limit, last_key)
+
+            submissions = result.get("submissions", [])
+            if not submissions:
+                break
+
+            if self.head_submission is None:
+                self.head_submission = {
+                    "id": int(submissions[0]["id"]),
+                    "timestamp": int(submissions[0].get("timestamp") or 0)
+                }
+
+            page_size = len(submissions)
+            last_key = result.get("lastKey")
+            self.last_key = last_key
+
+            submissions, reached_synced = trim_synced_submissions(submissions, since_id)
+
+            accepted_submissions = [
+                sub for sub in submissions
+                if sub.get("statusDisplay") == "Accepted"
+            ]
+            logger.info(f"Found {len(accepted_submissions)} accepted submissions in this batch")
+
+            for submission in await self.fetch_submission_details(accepted_submissions):
+                yield submission
+
+            if reached_synced or not result.get("hasNext", False) or page_size < limit:
+                break
+
+            offset += limit
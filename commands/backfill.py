@@ -0,0 +1,160 @@
+"""
+Backfill implementation
+Write fetched solutions straight into git history with `git fast-import`
+"""
+
+import logging
+import subprocess
+import time
+from typing import Dict, List, Optional
+
+from .git_repo import GitRepo
+from .manifest import SOLUTIONS_DIR
+
+DEFAULT_BACKFILL_MESSAGE = "Backfill LeetCode submissions"
+
+
+class FastImportBackfill:
+    """
+    Streams solution files into a `git fast-import` process
+
+    Each file becomes a blob as soon as it is added, so only marks and
+    metadata stay in memory. finish() then writes either one commit for
+    everything or one commit per problem, oldest first and dated with the
+    submission timestamp, on top of the current branch. The working tree is
+    never written file by file; leetcodeProblems/ is checked out from the
+    new HEAD at the end. Files identical to HEAD are skipped.
+    """
+
+    def __init__(self, repo: GitRepo, commit_per_problem: bool = False,
+                 message: str = DEFAULT_BACKFILL_MESSAGE):
+        self.repo = repo
+        self.commit_per_problem = commit_per_problem
+        self.message = message
+        self.files = []
+        self.commits = 0
+        self._process = None
+        self._next_mark = 1
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+
+    def _git_output(self, *args: str) -> Optional[str]:
+        result = self.repo.run(*args)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    def start(self):
+        """Check the repository can be backfilled and start git fast-import"""
+        dirty = self._git_output("status", "--porcelain", "--", SOLUTIONS_DIR)
+        if dirty is None:
+            raise Exception(f"Not a Git repository: {self.repo.path}")
+        if dirty:
+            raise Exception(f"{SOLUTIONS_DIR}/ has uncommitted changes; commit or stash them before a backfill")
+
+        self.ref = self._git_output("symbolic-ref", "HEAD")
+        if self.ref is None:
+            raise Exception("Backfill needs a checked out branch (HEAD is detached)")
+        self.parent = self._git_output("rev-parse", "--verify", "--quiet", "HEAD")
+
+        ident = self._git_output("var", "GIT_COMMITTER_IDENT")
+        if not ident:
+            raise Exception("Git user identity is not configured (set user.name and user.email)")
+        self.ident = ident.rsplit(" ", 2)[0]
+
+        self._process = subprocess.Popen(
+            ["git", "-C", str(self.repo.path), "fast-import", "--quiet", "--done"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+
+    def _write(self, data: bytes):
+        self._process.stdin.write(data)
+
+    def _write_data(self, content: bytes):
+        self._write(b"data %d\n" % len(content))
+        self._write(content)
+        self._write(b"\n")
+
+    def add(self, submission: Dict, path: str, content: bytes) -> bool:
+        """
+        Stream one solution file into the import
+        Returns False if HEAD already has this exact content
+        """
+        head_id = self.repo.head_blob_id(path)
+        if head_id == self.repo.blob_id(content):
+            return False
+
+        mark = self._next_mark
+        self._next_mark += 1
+        self._write(b"blob\nmark :%d\n" % mark)
+        self._write_data(content)
+
+        question = submission.get("question") or {}
+        self.files.append({
+            "path": path,
+            "mark": mark,
+            "slug": submission.get("titleSlug", ""),
+            "title": submission.get("title") or question.get("title") or submission.get("titleSlug", ""),
+            "difficulty": question.get("difficulty") or "",
+            "timestamp": int(submission.get("timestamp") or 0),
+            "existed": head_id is not None,
+        })
+        return True
+
+    def _write_commit(self, message: str, timestamp: int, files: List[Dict]):
+        self._write(f"commit {self.ref}\n".encode('utf-8'))
+        self._write(f"author {self.ident} {timestamp} +0000\n".encode('utf-8'))
+        self._write(f"committer {self.ident} {timestamp} +0000\n".encode('utf-8'))
+        self._write_data(message.encode('utf-8'))
+        if self.parent and not self.commits:
+            self._write(f"from {self.parent}\n".encode('utf-8'))
+        for file in files:
+            self._write(f"M 100644 :{file['mark']} {file['path']}\n".encode('utf-8'))
+        self.commits += 1
+
+    def finish(self) -> int:
+        """
+        Write the commits, wait for git fast-import and check out the new files
+        Returns the number of commits created
+        """
+        logger = logging.getLogger()
+
+        if self.files and self.commit_per_problem:
+            problems = {}
+            for file in self.files:
+                problems.setdefault(file["slug"], []).append(file)
+
+            # Oldest problem first, each dated with its newest submission
+            for files in sorted(problems.values(), key=lambda files: max(f["timestamp"] for f in files)):
+                title, difficulty = files[0]["title"], files[0]["difficulty"]
+                action = "Update" if all(f["existed"] for f in files) else "Add"
+                message = f"{action} {title}" + (f" ({difficulty})" if difficulty else "")
+                self._write_commit(message, max(f["timestamp"] for f in files), files)
+        elif self.files:
+            self._write_commit(f"{self.message} ({len(self.files)} files)", int(time.time()), self.files)
+
+        self._write(b"done\n")
+        self._process.stdin.close()
+        stderr = self._process.stderr.read().decode('utf-8', errors='replace')
+        if self._process.wait() != 0:
+            raise Exception(f"git fast-import failed: {stderr.strip()}")
+
+        if self.commits:
+            result = self.repo.run("checkout", "HEAD", "--", SOLUTIONS_DIR)
+            if result.returncode != 0:
+                raise Exception(f"git checkout failed: {result.stderr.strip()}")
+
+        logger.info(f"Backfill imported {len(self.files)} files in {self.commits} commits onto {self.ref}")
+        return self.commits
+
+    def abort(self):
+        """Stop git fast-import without updating the branch"""
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
@@ -0,0 +1,163 @@
+"""
+Problem catalog implementation
+Locally cached LeetCode problem list used to resolve difficulty and metadata
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .retry import FatalAPIError
+
+# Full refresh once the cached catalog is older than this
+CATALOG_TTL = 7 * 24 * 60 * 60  # seconds
+
+# Problems requested per problem-list page
+CATALOG_PAGE_SIZE = 100
+
+
+def get_catalog_path() -> Path:
+    """Get the path of the cached problem catalog (shared by all users)"""
+    return Path.cwd() / "cache" / "problem_catalog.json"
+
+
+class ProblemCatalog:
+    """
+    Cache of slug -> question id, frontend id, title, difficulty and tags
+
+    Bulk-loaded from the paginated problem list and kept on disk, so
+    difficulty never depends on a per-submission detail call. The catalog
+    is only an optimization: when the problem list cannot be loaded, or
+    lacks a problem, callers fall back to downloading the question info.
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = path or get_catalog_path()
+        self.problems = {}
+        self.fetched_at = 0.0
+        # Slugs the problem list did not have (premium or removed problems), remembered for this run
+        self.unlisted = set()
+        # Set once a refresh failed, so the rest of the run only uses the cached problems
+        self.offline = False
+        self.load()
+
+    def load(self):
+        """Load the catalog from disk, starting empty if it is missing or unreadable"""
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.problems = data.get("problems", {})
+            self.fetched_at = data.get("fetched_at", 0.0)
+        except Exception as e:
+            logging.getLogger().warning(f"Ignoring unreadable problem catalog {self.path}: {e}")
+
+    def save(self):
+        """Save the catalog to disk, atomically since several users' fetches may share it"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"fetched_at": self.fetched_at, "problems": self.problems}, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def is_stale(self, ttl: float = CATALOG_TTL) -> bool:
+        """Whether the catalog is empty or older than ttl seconds"""
+        return not self.problems or time.time() - self.fetched_at > ttl
+
+    def refresh(self, api, full: bool = False) -> int:
+        """
+        Load problems from the API and save the catalog
+        The problem list is ordered by frontend id, so an incremental
+        refresh only pages past the problems already cached.
+        Returns the number of problems added or updated
+        """
+        logger = logging.getLogger()
+        skip = 0 if full else len(self.problems)
+        updated = 0
+
+        while True:
+            page = api.fetch_problem_list(skip=skip, limit=CATALOG_PAGE_SIZE)
+            questions = page.get("questions") or []
+
+            for question in questions:
+                self.problems[question["titleSlug"]] = {
+                    "questionId": question.get("questionId"),
+                    "frontendId": question.get("questionFrontendId"),
+                    "title": question.get("title"),
+                    "difficulty": question.get("difficulty"),
+                    "topicTags": [tag.get("slug") for tag in question.get("topicTags") or []],
+                }
+            updated += len(questions)
+            skip += len(questions)
+
+            if len(questions) < CATALOG_PAGE_SIZE or skip >= (page.get("total") or 0):
+                break
+
+        if full:
+            self.fetched_at = time.time()
+        self.save()
+
+        logger.info(f"Problem catalog {'rebuilt' if full else 'updated'}: {updated} problems loaded, {len(self.problems)} cached")
+        return updated
+
+    def ensure(self, api, title_slugs: Iterable[str], ttl: float = CATALOG_TTL) -> bool:
+        """
+        Make sure the catalog is fresh and knows every given slug
+        A failed refresh is logged and not retried for the rest of the run.
+        Returns True if every slug can be resolved locally
+        """
+        if self.is_stale(ttl):
+            self.try_refresh(api, full=True)
+
+        missing = {slug for slug in title_slugs if slug not in self.problems}
+        new_missing = missing - self.unlisted
+        if new_missing:
+            # Probably problems published since the last refresh
+            self.try_refresh(api)
+            missing = {slug for slug in missing if slug not in self.problems}
+            new_missing = {slug for slug in new_missing if slug not in self.problems}
+
+            if new_missing and not self.offline:
+                logging.getLogger().warning(f"Problems missing from the catalog: {', '.join(sorted(new_missing))}")
+                self.unlisted.update(new_missing)
+        return not missing
+
+    def try_refresh(self, api, full: bool = False):
+        """Refresh the catalog unless a refresh already failed in this run, logging any failure"""
+        if self.offline:
+            return
+
+        try:
+            self.refresh(api, full=full)
+        except FatalAPIError:
+            raise
+        except Exception as e:
+            logging.getLogger().warning(f"Could not load the problem list, downloading question info instead: {e}")
+            self.offline = True
+
+    def get(self, title_slug: str) -> Optional[Dict]:
+        """Get the cached info for a problem, or None"""
+        return self.problems.get(title_slug)
+
+    def annotate(self, submission: Dict) -> Dict:
+        """Fill in the question info of a submission from the catalog"""
+        problem = self.get(submission.get("titleSlug", ""))
+        if problem is None:
+            return submission
+
+        question = {**(submission.get("question") or {})}
+        question.update({
+            "questionId": problem["questionId"],
+            "questionFrontendId": problem["frontendId"],
+            "titleSlug": submission["titleSlug"],
+            "title": question.get("title") or problem["title"],
+            "difficulty": problem["difficulty"],
+        })
+        submission["question"] = question
+        return submission
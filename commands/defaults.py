@@ -0,0 +1,23 @@
+"""
+Sync defaults
+Default fetch, watch and all-users settings, kept free of imports so the CLI can show them without loading the commands
+"""
+
+# Detail fetching - overridable per run with fetch options
+DEFAULT_WORKERS = 4
+DEFAULT_BATCH_SIZE = 10  # submissionDetails lookups per GraphQL request
+
+# Request budget of the token bucket
+DEFAULT_RATE = 2.0  # requests per second
+DEFAULT_BURST = 4
+
+# Retries and timeouts per API request
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_READ_TIMEOUT = 30.0  # seconds
+
+# Polling interval bounds of watch
+DEFAULT_MIN_INTERVAL = 60.0  # seconds, used right after activity
+DEFAULT_MAX_INTERVAL = 900.0  # seconds, reached after a long idle spell
+
+# Users synced at the same time with --all-users
+DEFAULT_MAX_PARALLEL = 4
@@ -3,376 +3,452 @@ Fetch command implementation
 Fetch new accepted submissions from LeetCode using GraphQL API
 """
 
+import itertools
 import json
 import logging
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import click
 import requests
+from requests.adapters import HTTPAdapter
 
+from .pipeline import bounded_map_unordered, prefetch
+from .queries import (DEFAULT_DETAIL_PROFILE, LEETCODE_GRAPHQL_URL, PROBLEM_LIST_QUERY,
+                      SUBMISSION_DETAIL_QUERY_TEMPLATE, SUBMISSION_LIST_QUERY,
+                      build_batch_detail_query, get_detail_fields,
+                      get_request_headers, merge_batch_results,
+                      merge_submission_details, split_batch_response)
+from .backfill import FastImportBackfill
+from .catalog import ProblemCatalog
+from .defaults import (DEFAULT_BATCH_SIZE, DEFAULT_BURST, DEFAULT_MAX_ATTEMPTS,
+                       DEFAULT_RATE, DEFAULT_READ_TIMEOUT, DEFAULT_WORKERS)
+from .git_repo import GitRepo
+from .journal import FetchJournal, get_journal_path
+from .manifest import SolutionIndex
+from .metrics import METRICS
+from .profiling import mark_phase
+from .tracing import add_span, span
+from .rate_limit import TokenBucket
+from .retry import (CircuitBreaker, FatalAPIError, RetryPolicy, TransientError,
+                    check_graphql_auth, check_status)
 from .set_user import get_user_config
+from .solutions import (DEFAULT_WRITERS, DIFFICULTY_FOLDERS, LANGUAGE_EXTENSIONS,
+                        get_submission_path, render_submission, write_submissions)
+from .store import SubmissionStore, get_store_path
+from .sync_state import (load_sync_state, save_sync_state,
+                         trim_synced_submissions)
 
-# Language extension mapping
-LANGUAGE_EXTENSIONS = {
-    "python": ".py",
-    "python3": ".py",
-    "javascript": ".js",
-    "java": ".java",
-    "cpp": ".cpp",
-    "c": ".c"
-}
-
-# Difficulty mapping
-DIFFICULTY_FOLDERS = {
-    1: "easy",
-    2: "medium", 
-    3: "hard"
-}
+# What to do with submissions whose file already exists (ask, skip or overwrite)
+DEFAULT_DUPLICATE_POLICY = "ask"
 
 class LeetCodeAPI:
     """LeetCode API client for fetching submissions"""
     
-    def __init__(self, cookie: str):
+    def __init__(self, cookie: str, limiter: TokenBucket = None, workers: int = DEFAULT_WORKERS,
+                 batch_size: int = DEFAULT_BATCH_SIZE, retry_policy: RetryPolicy = None,
+                 breaker: CircuitBreaker = None, base_url: str = LEETCODE_GRAPHQL_URL,
+                 detail_profile: str = DEFAULT_DETAIL_PROFILE):
         self.cookie = cookie
         self.session = requests.Session()
-        self.base_url = "https://leetcode.com/graphql"
+        self.base_url = base_url
+        self.limiter = limiter or TokenBucket(DEFAULT_RATE, DEFAULT_BURST)
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        # Which submissionDetails fields are requested, and the response bytes that cost
+        self.detail_profile = detail_profile
+        self.detail_bytes = 0
+        self.details_requested = 0
+        self._bytes_lock = threading.Lock()
+        
+        # Size the connection pool so every detail worker, and the thread listing pages, can keep a connection alive
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers + 1)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         
         # Set up session headers
-        self.session.headers.update({
-            "Content-Type": "application/json",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Referer": "https://leetcode.com/",
-            "Cookie": f"LEETCODE_SESSION={cookie}",
-        })
-    
-    def get_submission_detail(self, submission_id: str) -> Dict:
-        """Get detailed submission info including code"""
-        query = """
-        query submissionDetails($submissionId: Int!) {
-            submissionDetails(submissionId: $submissionId) {
-                runtime
-                runtimeDisplay
-                runtimePercentile
-                runtimeDistribution
-                memory
-                memoryDisplay
-                memoryPercentile
-                memoryDistribution
-                code
-                timestamp
-                statusCode
-                user {
-                    username
-                    profile {
-                        realName
-                        userAvatar
-                    }
-                }
-                lang {
-                    name
-                    verboseName
-                }
-                question {
-                    questionId
-                    titleSlug
-                    title
-                    translatedTitle
-                    difficulty
-                }
-                notes
-                flagType
-                topicTags {
-                    name
-                    slug
-                }
-                runtimeError
-                compileError
-                lastTestcase
-            }
-        }
+        self.session.headers.update(get_request_headers(cookie))
+    
+    def _post(self, query: str, variables: Dict, operation: str = "graphql", require_data: bool = False) -> Dict:
         """
-        
-        variables = {"submissionId": int(submission_id)}
+        Send a GraphQL request once the rate limiter allows it and return the raw response
+        Timeouts, connection errors, 429 and 5xx are retried per self.retry_policy;
+        a rejected cookie (HTTP 401/403 or a GraphQL auth error) raises AuthError
+        and sustained failures open self.breaker. A 429 with Retry-After holds
+        back the shared limiter instead of counting as a failure. With
+        require_data, an all-null response also means the cookie expired.
+        Requests, latency, bytes, waits and retries are recorded in METRICS under `operation`
+        """
+        logger = logging.getLogger()
         payload = {"query": query, "variables": variables}
-        
-        response = self.session.post(self.base_url, json=payload)
-        response.raise_for_status()
-        
-        data = response.json()
+        max_attempts = self.retry_policy.max_attempts
+        
+        for attempt in range(1, max_attempts + 1):
+            self.breaker.check()
+            wait_start = time.perf_counter()
+            waited = self.limiter.acquire()
+            METRICS.observe("rate_limit_wait_seconds", waited)
+            if waited:
+                add_span("rate limit wait", "rate_limit", wait_start, time.perf_counter())
+            
+            METRICS.inc("api_requests_total", operation=operation)
+            request_start = time.perf_counter()
+            try:
+                try:
+                    response = self.session.post(self.base_url, json=payload, timeout=self.retry_policy.timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    raise TransientError(f"{type(e).__name__}: {e}")
+                finally:
+                    request_end = time.perf_counter()
+                    METRICS.observe("api_request_seconds", request_end - request_start, operation=operation)
+                    add_span(f"POST {operation}", "http", request_start, request_end, attempt=attempt)
+                
+                METRICS.inc("api_response_bytes_total", len(response.content), operation=operation)
+                if operation.startswith("detail"):
+                    self._count_detail_bytes(len(response.content))
+                check_status(response.status_code, response.headers.get("Retry-After"))
+                response.raise_for_status()
+                data = response.json()
+                check_graphql_auth(data, require_data)
+            except TransientError as e:
+                METRICS.inc("api_errors_total", operation=operation, reason=str(e).split(":")[0])
+                if e.throttled:
+                    # Every worker waits until LeetCode said to come back, through the limiter
+                    self.limiter.defer(min(e.retry_after, self.retry_policy.max_delay))
+                else:
+                    self.breaker.record_failure()
+                if attempt == max_attempts:
+                    raise
+                
+                # Abort straight away instead of sleeping once the circuit has opened
+                self.breaker.check()
+                
+                if e.throttled:
+                    logger.warning(f"Rate limited by LeetCode, retrying in {e.retry_after:.1f}s "
+                                   f"(attempt {attempt + 1}/{max_attempts})")
+                    METRICS.inc("api_retries_total", operation=operation)
+                    continue
+                
+                delay = self.retry_policy.compute_delay(attempt, e.retry_after)
+                logger.warning(f"API call failed ({e}), retrying in {delay:.1f}s (attempt {attempt + 1}/{max_attempts})")
+                METRICS.inc("api_retries_total", operation=operation)
+                METRICS.observe("retry_sleep_seconds", delay)
+                with span("retry sleep", "retry", operation=operation, reason=str(e)):
+                    time.sleep(delay)
+                continue
+            
+            self.breaker.record_success()
+            return data
+    
+    def _count_detail_bytes(self, size: int):
+        METRICS.inc("detail_response_bytes_total", size, profile=self.detail_profile)
+        with self._bytes_lock:
+            self.detail_bytes += size
+    
+    def _graphql(self, query: str, variables: Dict, operation: str = "graphql", require_data: bool = False) -> Dict:
+        """Send a GraphQL request and return its data, raising on any GraphQL error"""
+        data = self._post(query, variables, operation, require_data)
         if "errors" in data:
             raise Exception(f"GraphQL errors: {data['errors']}")
         
-        return data["data"]["submissionDetails"]
+        return data["data"]
+    
+    def get_submission_detail(self, submission_id: str, include_question: bool = True) -> Dict:
+        """
+        Get detailed submission info including code
+        Only the fields of self.detail_profile are requested; the question
+        block can be skipped when the problem catalog provides it
+        """
+        query = SUBMISSION_DETAIL_QUERY_TEMPLATE % get_detail_fields(include_question, self.detail_profile)
+        variables = {"submissionId": int(submission_id)}
+        with self._bytes_lock:
+            self.details_requested += 1
+        details = self._graphql(query, variables, "detail")["submissionDetails"]
+        if details is None:
+            raise Exception("no data returned")
+        return details
 
-    def fetch_submissions(self, offset: int = 0, limit: int = 50) -> Dict:
+    def get_submission_details_batch(self, submission_ids: List[str], include_question: bool = True) -> Dict:
+        """
+        Get detailed info for many submissions in a single request
+        Returns a dict of submission id -> details, or the Exception raised
+        for that id when only part of the batch failed
+        """
+        fields = get_detail_fields(include_question, self.detail_profile)
+        query, variables, aliases = build_batch_detail_query(submission_ids, fields)
+        with self._bytes_lock:
+            self.details_requested += len(submission_ids)
+        response = self._post(query, variables, "detail_batch")
+        return split_batch_response(response, submission_ids, aliases)
+
+    def fetch_submissions(self, offset: int = 0, limit: int = 50, last_key: str = None) -> Dict:
         """
         Fetch submissions from LeetCode GraphQL API
         
         Based on research and specification:
         - Uses submissionList query
         - Fetches in batches of 50
+        - Passes the lastKey of the previous page as pagination cursor
         - Returns submissions with required fields
         """
         
-        # GraphQL query - corrected based on LeetCode's actual API
-        query = """
-        query submissionList($offset: Int!, $limit: Int!) {
-            submissionList(offset: $offset, limit: $limit) {
-                lastKey
-                hasNext
-                submissions {
-                    id
-                    title
-                    titleSlug
-                    status
-                    statusDisplay
-                    lang
-                    runtime
-                    timestamp
-                    url
-                    isPending
-                    memory
-                    __typename
-                }
-            }
-        }
-        """
-        
         variables = {
             "offset": offset,
-            "limit": limit
+            "limit": limit,
+            "lastKey": last_key
         }
         
-        payload = {
-            "query": query,
-            "variables": variables
+        # The list always has data for a signed-in session, so null means the cookie expired
+        return self._graphql(SUBMISSION_LIST_QUERY, variables, "list", require_data=True)["submissionList"]
+    
+    def fetch_problem_list(self, skip: int = 0, limit: int = 100) -> Dict:
+        """Fetch one page of the problem list (id, frontend id, difficulty, tags)"""
+        variables = {
+            "categorySlug": "",
+            "skip": skip,
+            "limit": limit,
+            "filters": {}
         }
+        return self._graphql(PROBLEM_LIST_QUERY, variables, "problem_list")["problemsetQuestionList"]
+    
+    def _fetch_detail(self, submission: Dict, include_question: bool = True) -> Dict:
+        """Fetch and merge the details of one submission, keeping the basic info on failure"""
+        logger = logging.getLogger()
+        submission_id = submission.get("id")
         
-        response = self.session.post(self.base_url, json=payload)
-        response.raise_for_status()
+        try:
+            logger.info(f"Fetching details for submission {submission_id}")
+            details = self.get_submission_detail(submission_id, include_question)
+            
+            # Merge the basic info with detailed info
+            return merge_submission_details(submission, details)
+        except FatalAPIError:
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to get details for submission {submission_id}: {e}")
+            # Continue with basic submission info if details fail
+            return submission
+    
+    def fetch_detail_batch(self, submissions: List[Dict], include_question: bool = True) -> List[Dict]:
+        """
+        Fetch and merge the details of a batch of submissions in one request
+        Submissions whose details fail keep only their basic info
+        """
+        if len(submissions) == 1:
+            return [self._fetch_detail(submissions[0], include_question)]
         
-        data = response.json()
+        logger = logging.getLogger()
+        submission_ids = [sub["id"] for sub in submissions]
+        
+        try:
+            logger.info(f"Fetching details for {len(submission_ids)} submissions in one request")
+            results = self.get_submission_details_batch(submission_ids, include_question)
+        except FatalAPIError:
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to get details for submissions {', '.join(submission_ids)}: {e}")
+            return submissions
+        
+        return merge_batch_results(submissions, results)
+    
+    def split_batches(self, submissions: List[Dict]) -> List[List[Dict]]:
+        """Split submissions into detail batches of self.batch_size"""
+        submissions = [sub for sub in submissions if sub.get("id")]
+        return [
+            submissions[start:start + self.batch_size]
+            for start in range(0, len(submissions), self.batch_size)
+        ]
+    
+    def fetch_submission_details(self, submissions: List[Dict], include_question: bool = True) -> List[Dict]:
+        """
+        Fetch details for many submissions concurrently
+        Submissions are looked up self.batch_size at a time per request,
+        using self.workers threads over the shared session; the request
+        rate is governed by self.limiter. Results keep the input order.
+        """
+        batches = self.split_batches(submissions)
+        if not batches:
+            return []
         
-        if "errors" in data:
-            raise Exception(f"GraphQL errors: {data['errors']}")
+        def fetch_batch(batch):
+            return self.fetch_detail_batch(batch, include_question)
         
-        return data["data"]["submissionList"]
+        if self.workers == 1 or len(batches) == 1:
+            results = [fetch_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="lcsync-detail") as executor:
+                results = list(executor.map(fetch_batch, batches))
+        
+        return [submission for batch in results for submission in batch]
     
-    def fetch_all_accepted_submissions(self) -> List[Dict]:
+    def iter_accepted_pages(self, since_id: int = None, offset: int = 0,
+                            last_key: str = None) -> Iterator[List[Dict]]:
         """
-        Fetch all accepted submissions with pagination
-        Only returns submissions with statusDisplay == "Accepted"
+        Page through the submission list, yielding the accepted submissions
+        of each page (basic info only, no code)
+        
+        Submissions are listed newest first, so when since_id is given
+        paging stops at the first submission with an id <= since_id.
+        The newest submission seen is recorded in self.head_submission,
+        the last pagination cursor in self.last_key and the offset of the
+        next page in self.next_offset; offset and last_key continue an
+        interrupted listing.
         """
-        all_submissions = []
-        offset = 0
         limit = 20  # Reduce limit to be more conservative
+        reached_synced = False
+        
+        self.head_submission = None
+        self.last_key = last_key
+        self.next_offset = offset
         
         logger = logging.getLogger()
         
         while True:
-            try:
-                logger.info(f"Fetching submissions: offset={offset}, limit={limit}")
-                
-                # Retry logic: 3 attempts with 2-second delay
-                for attempt in range(3):
-                    try:
-                        result = self.fetch_submissions(offset, limit)
-                        break
-                    except Exception as e:
-                        if attempt < 2:  # Not the last attempt
-                            logger.warning(f"API call failed (attempt {attempt + 1}/3): {e}")
-                            time.sleep(2)
-                        else:
-                            raise
-                
-                submissions = result.get("submissions", [])
-                
-                if not submissions:
-                    break
-                
-                # Filter for accepted submissions only
-                accepted_submissions = [
-                    sub for sub in submissions 
-                    if sub.get("statusDisplay") == "Accepted"
-                ]
-                
-                logger.info(f"Found {len(accepted_submissions)} accepted submissions in this batch")
-                
-                # Get detailed info for each accepted submission (including code)
-                detailed_submissions = []
-                for submission in accepted_submissions:
-                    try:
-                        submission_id = submission.get("id")
-                        if submission_id:
-                            logger.info(f"Fetching details for submission {submission_id}")
-                            details = self.get_submission_detail(submission_id)
-                            
-                            # Merge the basic info with detailed info
-                            merged_submission = {
-                                **submission,
-                                "code": details.get("code", ""),
-                                "question": details.get("question", {}),
-                                "lang_details": details.get("lang", {})
-                            }
-                            detailed_submissions.append(merged_submission)
-                            
-                            # Small delay to be respectful to the API
-                            time.sleep(0.5)
-                            
-                    except Exception as e:
-                        logger.warning(f"Failed to get details for submission {submission.get('id')}: {e}")
-                        # Continue with basic submission info if details fail
-                        detailed_submissions.append(submission)
-                
-                all_submissions.extend(detailed_submissions)
-                
-                # Check if there are more submissions
-                if not result.get("hasNext", False) or len(submissions) < limit:
-                    break
-                
-                offset += limit
-                
-                # Rate limiting - be respectful to LeetCode
-                time.sleep(2)
-                
-            except Exception as e:
-                if "session" in str(e).lower() or "unauthorized" in str(e).lower() or "401" in str(e):
-                    raise Exception("Session cookie may have expired. Please run 'set_cookie' to update.")
-                raise
+            logger.info(f"Fetching submissions: offset={offset}, limit={limit}")
+            
+            # Retries, timeouts and auth failures are handled by the retry policy
+            result = self.fetch_submissions(offset, limit, last_key)
+            
+            submissions = result.get("submissions", [])
+            
+            if not submissions:
+                break
+            
+            if self.head_submission is None:
+                self.head_submission = {
+                    "id": int(submissions[0]["id"]),
+                    "timestamp": int(submissions[0].get("timestamp") or 0)
+                }
+            
+            page_size = len(submissions)
+            METRICS.inc("list_pages_total")
+            last_key = result.get("lastKey")
+            self.last_key = last_key
+            
+            # Drop everything at or below the last synced submission
+            submissions, reached_synced = trim_synced_submissions(submissions, since_id)
+            
+            # Filter for accepted submissions only
+            accepted_submissions = [
+                sub for sub in submissions 
+                if sub.get("statusDisplay") == "Accepted"
+            ]
+            
+            logger.info(f"Found {len(accepted_submissions)} accepted submissions in this batch")
+            METRICS.inc("submissions_listed_total", len(accepted_submissions))
+            self.next_offset = offset + limit
+            yield accepted_submissions
+            
+            # Check if there are more submissions
+            if reached_synced or not result.get("hasNext", False) or page_size < limit:
+                break
+            
+            offset += limit
         
-        logger.info(f"Total accepted submissions fetched: {len(all_submissions)}")
+        mark_phase("paging")
+    
+    def get_latest_submission_id(self) -> Optional[int]:
+        """Id of the newest submission of any status, or None if there are none (one small request)"""
+        submissions = self.fetch_submissions(offset=0, limit=1).get("submissions", [])
+        return int(submissions[0]["id"]) if submissions else None
+    
+    def list_accepted_submissions(self, since_id: int = None) -> List[Dict]:
+        """
+        List all accepted submissions with pagination, without their code
+        Cheap enough to plan which details are worth downloading
+        """
+        return [sub for page in self.iter_accepted_pages(since_id) for sub in page]
+    
+    def fetch_all_accepted_submissions(self, since_id: int = None) -> List[Dict]:
+        """
+        Fetch all accepted submissions with pagination
+        Only returns submissions with statusDisplay == "Accepted",
+        each merged with its details (including code)
+        """
+        all_submissions = []
+        
+        for accepted_submissions in self.iter_accepted_pages(since_id):
+            # Get detailed info for each accepted submission (including code)
+            all_submissions.extend(self.fetch_submission_details(accepted_submissions))
+        
+        logging.getLogger().info(f"Total accepted submissions fetched: {len(all_submissions)}")
         return all_submissions
 
-def get_existing_files(repo_dir: Path = None) -> Set[str]:
-    """Get set of existing submission files to avoid duplicates"""
-    if repo_dir is None:
-        repo_dir = Path.cwd()
-    
-    existing_files = set()
-    
-    for difficulty in ["easy", "medium", "hard"]:
-        difficulty_dir = repo_dir / "leetcodeProblems" / difficulty
-        if difficulty_dir.exists():
-            for file_path in difficulty_dir.iterdir():
-                if file_path.is_file() and file_path.suffix in LANGUAGE_EXTENSIONS.values():
-                    # Use filename without extension as identifier
-                    existing_files.add(file_path.stem)
-    
-    return existing_files
-
-def save_submission(submission: Dict, project_root: Path) -> bool:
+class DetailPlanner:
     """
-    Save a submission to the appropriate directory
-    Returns True if file was saved, False if skipped
+    Decide which listed submissions are worth downloading, before any code is fetched
+    
+    Only one file is written per problem and extension, so submissions are
+    collapsed to the newest accepted one per (titleSlug, extension).
+    Unsupported languages are dropped, and files already in the solutions
+    index are returned separately so the duplicate policy can decide on them.
+    Pages must be planned newest first; state carries across pages.
     """
-    logger = logging.getLogger()
     
-    try:
-        # Extract submission data - handle both old and new structure
-        title_slug = submission.get("titleSlug", "")
-        lang = submission.get("lang", "").lower()
-        code = submission.get("code", "")
-        
-        # Handle different difficulty formats
-        question_data = submission.get("question", {})
-        difficulty = question_data.get("difficulty")
-        
-        # Convert difficulty string to number if needed
-        if isinstance(difficulty, str):
-            difficulty_map = {"Easy": 1, "Medium": 2, "Hard": 3}
-            difficulty = difficulty_map.get(difficulty, difficulty)
-        
-        title = submission.get("title", "") or question_data.get("title", "")
-        
-        if not all([title_slug, lang, code]):
-            logger.warning(f"Missing required fields for submission: {submission.get('id')}")
-            logger.warning(f"Fields: title_slug={title_slug}, lang={lang}, code={'present' if code else 'missing'}")
-            return False
-        
-        # Get file extension
-        extension = LANGUAGE_EXTENSIONS.get(lang)
-        if not extension:
-            logger.warning(f"Unsupported language: {lang}")
-            return False
-        
-        # Get difficulty folder - default to medium if unknown
-        difficulty_folder = DIFFICULTY_FOLDERS.get(difficulty, "medium")
-        
-        # Create file path
-        filename = f"{title_slug}{extension}"
-        file_path = project_root / "leetcodeProblems" / difficulty_folder / filename
-        
-        # Check if file already exists
-        if file_path.exists():
-            return False  # Will be handled by duplicate detection
-        
-        # Ensure directory exists
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Prepare code content with header comment
-        header_comment = get_header_comment(submission, extension)
-        full_content = header_comment + "\n\n" + code
-        
-        # Save file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(full_content)
+    def __init__(self, index: SolutionIndex):
+        self.index = index
+        self.seen_keys = set()
+        self.listed = 0
+        self.planned = 0
+        self.superseded = 0
+        self.unsupported = 0
+    
+    def plan(self, submissions: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Plan one page of listed submissions
+        Returns (new submissions, duplicate submissions), newest first
+        """
+        new_submissions = []
+        duplicate_submissions = []
+        self.listed += len(submissions)
         
-        logger.info(f"Saved submission: {file_path.relative_to(project_root)}")
-        return True
+        # The submission list is newest first, so the first entry per key wins
+        for submission in submissions:
+            title_slug = submission.get("titleSlug", "")
+            extension = LANGUAGE_EXTENSIONS.get(submission.get("lang", "").lower())
+            
+            if not extension:
+                self.unsupported += 1
+                continue
+            
+            key = (title_slug, extension)
+            if key in self.seen_keys:
+                self.superseded += 1
+                continue
+            self.seen_keys.add(key)
+            
+            if key in self.index:
+                duplicate_submissions.append(submission)
+            else:
+                new_submissions.append(submission)
         
-    except Exception as e:
-        logger.error(f"Failed to save submission {submission.get('id')}: {e}")
-        return False
+        return new_submissions, duplicate_submissions
 
-def get_header_comment(submission: Dict, extension: str) -> str:
-    """Generate header comment for the submission file"""
-    title = submission.get("title", "") or submission.get("question", {}).get("title", "")
-    title_slug = submission.get("titleSlug", "")
-    lang = submission.get("lang", "")
-    
-    # Handle difficulty from different possible sources
-    difficulty = submission.get("question", {}).get("difficulty", "")
-    if isinstance(difficulty, int):
-        difficulty_text = DIFFICULTY_FOLDERS.get(difficulty, str(difficulty))
-    else:
-        difficulty_text = difficulty.lower() if difficulty else "unknown"
-    
-    if extension in [".py"]:
-        return f'''"""
-LeetCode Problem: {title}
-Difficulty: {difficulty_text.title()}
-Language: {lang}
-Link: https://leetcode.com/problems/{title_slug}/
-
-Auto-generated by LeetCode Submission Auto GitHub Push
-"""'''
-    elif extension in [".js"]:
-        return f'''/**
- * LeetCode Problem: {title}
- * Difficulty: {difficulty_text.title()}
- * Language: {lang}
- * Link: https://leetcode.com/problems/{title_slug}/
- * 
- * Auto-generated by LeetCode Submission Auto GitHub Push
- */'''
-    elif extension in [".java", ".cpp", ".c"]:
-        return f'''/**
- * LeetCode Problem: {title}
- * Difficulty: {difficulty_text.title()}
- * Language: {lang}
- * Link: https://leetcode.com/problems/{title_slug}/
- * 
- * Auto-generated by LeetCode Submission Auto GitHub Push
- */'''
-    else:
-        return f'''// LeetCode Problem: {title}
-// Difficulty: {difficulty_text.title()}
-// Language: {lang}
-// Link: https://leetcode.com/problems/{title_slug}/
-// 
-// Auto-generated by LeetCode Submission Auto GitHub Push'''
+def import_submissions(submissions: List[Dict], project_root: Path, backfill: FastImportBackfill) -> int:
+    """
+    Stream a batch of submissions into a git fast-import backfill
+    Returns the number of files imported
+    """
+    imported_count = 0
+    
+    for submission in submissions:
+        file_path = get_submission_path(submission, project_root)
+        if file_path is None:
+            logging.getLogger().warning(f"Not importing submission {submission.get('id')}: "
+                                        f"unsupported language or unknown difficulty")
+            continue
+        
+        content = render_submission(submission, file_path.suffix)
+        if backfill.add(submission, file_path.relative_to(project_root).as_posix(), content):
+            imported_count += 1
+    
+    return imported_count
 
 def handle_duplicates(duplicates: List[Dict], project_root: Path) -> List[Dict]:
     """
@@ -393,7 +469,7 @@ def handle_duplicates(duplicates: List[Dict], project_root: Path) -> List[Dict]:
     
     click.echo()
     click.echo("i = Ignore (keep old code)")
-    click.echo("w = Overwrite (replace old code)")
+    click.echo("w = Overwrite (replace old code; files whose code is unchanged are left alone)")
     click.echo()
     click.echo("⚠️  Warning: If code approach changed, Ignore will not update it; Overwrite may delete previous approach.")
     
@@ -406,13 +482,128 @@ def handle_duplicates(duplicates: List[Dict], project_root: Path) -> List[Dict]:
         logger.info(f"User chose to ignore {len(duplicates)} duplicate files") 
         return []
 
-def fetch_submissions():
-    """Main fetch command - fetch new accepted submissions from LeetCode"""
+def plan_detail_batches(api: LeetCodeAPI, pages: Iterable[List[Dict]], planner: DetailPlanner,
+                        catalog: ProblemCatalog, project_root: Path,
+                        on_duplicate: str = DEFAULT_DUPLICATE_POLICY) -> Iterator[Tuple[List[Dict], bool]]:
+    """
+    Turn pages of listed submissions into detail batches worth downloading
+    Yields (batch, include_question) as soon as api.batch_size submissions
+    needing the same fields are planned, accumulating across pages, and
+    the remainders once the pages run out.
+    Duplicates are downloaded only under the "overwrite" policy; with "ask"
+    the user is prompted once and the answer applies to the rest of the run.
+    """
+    overwrite_duplicates = {"skip": False, "overwrite": True}.get(on_duplicate)
+    # Planned submissions not batched yet, keyed by include_question
+    pending = {False: [], True: []}
+    
+    for page in pages:
+        new_submissions, duplicate_submissions = planner.plan(page)
+        planned_submissions = new_submissions
+        
+        if duplicate_submissions:
+            if overwrite_duplicates is None:
+                if sys.stdin.isatty():
+                    overwrite_duplicates = bool(handle_duplicates(duplicate_submissions, project_root))
+                else:
+                    # Nobody to ask in unattended runs: keep existing files
+                    logging.getLogger().warning("No terminal to ask about duplicates; keeping existing files "
+                                                "(use --on-duplicate to choose)")
+                    overwrite_duplicates = False
+            if overwrite_duplicates:
+                planned_submissions = planned_submissions + duplicate_submissions
+        
+        planner.planned += len(planned_submissions)
+        if not planned_submissions:
+            continue
+        
+        # Details only need the question block for problems the catalog lacks
+        catalog.ensure(api, {sub.get("titleSlug", "") for sub in planned_submissions})
+        
+        for submission in planned_submissions:
+            if not submission.get("id"):
+                continue
+            include_question = catalog.get(submission.get("titleSlug", "")) is None
+            batch = pending[include_question]
+            batch.append(submission)
+            if len(batch) >= api.batch_size:
+                yield batch, include_question
+                pending[include_question] = []
+    
+    for include_question, batch in pending.items():
+        if batch:
+            yield batch, include_question
+
+def update_sync_state(username: str, sync_state: Dict, api: LeetCodeAPI, failed_count: int):
+    """
+    Advance the sync cursor to the newest submission seen in this run
+    The cursor is kept in place if any submission could not be downloaded
+    or written, so the next run picks it up again
+    """
     logger = logging.getLogger()
     
+    if api.head_submission is None:
+        return
+    
+    if failed_count:
+        logger.warning(f"Sync cursor not advanced: {failed_count} submissions could not be downloaded or saved")
+        click.echo(f"⚠️  {failed_count} submissions could not be downloaded or saved; they will be retried next run")
+        return
+    
+    sync_state.update({
+        "last_submission_id": api.head_submission["id"],
+        "last_timestamp": api.head_submission["timestamp"],
+        "last_key": api.last_key
+    })
+    save_sync_state(username, sync_state)
+    logger.info(f"Sync cursor advanced to submission {api.head_submission['id']}")
+
+def fetch_submissions(full: bool = False, workers: int = DEFAULT_WORKERS,
+                      rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                      batch_size: int = DEFAULT_BATCH_SIZE, refresh_catalog: bool = False,
+                      retries: int = DEFAULT_MAX_ATTEMPTS - 1, timeout: float = DEFAULT_READ_TIMEOUT,
+                      on_duplicate: str = DEFAULT_DUPLICATE_POLICY, backfill: bool = False,
+                      commit_per_problem: bool = False, username: str = None,
+                      api: LeetCodeAPI = None, resume: bool = False,
+                      detail_profile: str = DEFAULT_DETAIL_PROFILE, resume_hint: bool = True) -> int:
+    """
+    Main fetch command - fetch new accepted submissions from LeetCode
+    Only pages back to the last synced submission unless full is True.
+    Difficulty comes from the cached problem catalog, rebuilt when stale
+    or when refresh_catalog is True.
+    Details are fetched `batch_size` per request by `workers` threads,
+    limited to `rate` requests per second with bursts of up to `burst`.
+    Each request times out after `timeout` seconds and is retried up to
+    `retries` times with exponential backoff.
+    Only the submissionDetails fields of `detail_profile` (minimal,
+    standard or full) are requested.
+    Existing files are handled per `on_duplicate` (ask, skip or overwrite);
+    overwriting only rewrites files whose content actually changed.
+    With backfill, solutions go straight into git history through
+    git fast-import instead of the working tree, optionally as one
+    commit per problem dated with its submission timestamp.
+    
+    Submissions stream through list pages -> planning -> details -> write:
+    the next page is prefetched while details download, and each file is
+    written as soon as its details arrive.
+    An open `api` client (kept warm by watch) is reused instead of creating
+    one; its own rate limit and retry settings then apply.
+    
+    Progress is journaled to users/<username>.journal as it happens. With
+    resume, the journal of an interrupted run is replayed: listed pages
+    are not requested again, details already in the store are not
+    downloaded again and files already written are not rewritten.
+    resume_hint=False leaves the 'fetch --resume' hint out of errors, for
+    callers that resume on their own.
+    Failures are raised as ClickException chained to the original error.
+    Returns the number of submissions saved
+    """
+    logger = logging.getLogger()
+    journal = None
+    
     try:
         # Get user configuration
-        username, config = get_user_config()
+        username, config = get_user_config(username)
         
         leetcode_cookie = config.get("LEETCODE_COOKIE", "")
         if not leetcode_cookie:
@@ -422,64 +613,197 @@ def fetch_submissions():
         click.echo()
         
         # Initialize API client
-        api = LeetCodeAPI(leetcode_cookie)
+        if api is None:
+            api = LeetCodeAPI(leetcode_cookie, limiter=TokenBucket(rate, burst),
+                              workers=workers, batch_size=batch_size,
+                              retry_policy=RetryPolicy(max_attempts=retries + 1, read_timeout=timeout),
+                              detail_profile=detail_profile)
         
         # Get GitHub repository directory from user config
         github_repo_dir = Path(config["GITHUB_REPO_DIR"])
         
-        # Get existing files to detect duplicates
-        existing_files = get_existing_files(github_repo_dir)
-        click.echo(f"📁 Found {len(existing_files)} existing submission files")
-        
-        # Fetch all accepted submissions
-        click.echo("🔍 Fetching submissions from LeetCode...")
-        submissions = api.fetch_all_accepted_submissions()
-        
-        if not submissions:
-            click.echo("ℹ️  No accepted submissions found")
-            return
+        # Load the solutions index to detect duplicates
+        index = SolutionIndex(github_repo_dir, LANGUAGE_EXTENSIONS)
+        click.echo(f"📁 Found {len(index)} existing submission files")
         
-        click.echo(f"✅ Fetched {len(submissions)} accepted submissions")
+        # Resume from the last synced submission unless a full rescan was requested
+        sync_state = load_sync_state(username)
+        since_id = None if full else sync_state.get("last_submission_id")
         
-        # Separate new and duplicate submissions
-        new_submissions = []
-        duplicate_submissions = []
-        
-        for submission in submissions:
-            title_slug = submission.get("titleSlug", "")
-            if title_slug in existing_files:
-                duplicate_submissions.append(submission)
-            else:
-                new_submissions.append(submission)
-        
-        click.echo(f"📊 Analysis: {len(new_submissions)} new, {len(duplicate_submissions)} duplicates")
-        
-        # Handle duplicates if any
-        submissions_to_save = new_submissions.copy()
-        if duplicate_submissions:
-            duplicate_choices = handle_duplicates(duplicate_submissions, github_repo_dir)
-            submissions_to_save.extend(duplicate_choices)
+        # Pick up an interrupted run where it stopped, or journal this one from scratch
+        journal = FetchJournal(get_journal_path(username))
+        if resume and journal.load():
+            since_id, backfill, commit_per_problem = journal.since_id, journal.backfill, journal.commit_per_problem
+            journal.reopen()
+            click.echo(f"↩️  Resuming the fetch started {journal.started_at} ({journal.summary()})")
+        else:
+            if resume:
+                click.echo("ℹ️  No usable journal of an interrupted fetch; starting a new one")
+            elif journal.exists():
+                logger.info(f"Discarding the journal of an interrupted fetch: {journal.path}")
+            journal.start(since_id, backfill, commit_per_problem)
+        
+        if since_id is None:
+            click.echo("🔍 Fetching full submission history from LeetCode...")
+        else:
+            click.echo(f"🔍 Fetching submissions newer than #{since_id} from LeetCode...")
+        
+        # Resolve difficulty and problem info from the local catalog
+        catalog = ProblemCatalog()
+        if refresh_catalog:
+            catalog.try_refresh(api, full=True)
+        
+        planner = DetailPlanner(index)
+        saved_count = 0
+        failed_count = 0
+        
+        write_seconds = 0.0
+        commit_count = 0
+        
+        # Backfill streams solutions into git history instead of writing files
+        backfiller = None
+        if backfill:
+            backfiller = FastImportBackfill(GitRepo(github_repo_dir), commit_per_problem,
+                                            config["GITHUB_COMMIT_MESSAGE"])
+            backfiller.start()
+            click.echo("📦 Backfill: writing solutions straight into git history")
+        
+        # The api may be reused across runs, so this run's share of its counters is taken at the end
+        detail_bytes_start, details_requested_start = api.detail_bytes, api.details_requested
+        
+        # Paging, details and writes overlap, so the pipeline is timed as a whole
+        sync_start = time.perf_counter()
+        try:
+            with SubmissionStore(get_store_path(username)) as store, \
+                    ThreadPoolExecutor(max_workers=api.workers, thread_name_prefix="lcsync-detail") as executor, \
+                    ThreadPoolExecutor(max_workers=DEFAULT_WRITERS, thread_name_prefix="lcsync-write") as writer:
+                # Journaled pages are replayed first, then listing continues after them
+                pages = iter(journal.pages)
+                if not journal.listed:
+                    live_pages = api.iter_accepted_pages(since_id=since_id, offset=journal.next_offset,
+                                                         last_key=journal.last_key)
+                    pages = itertools.chain(pages, prefetch(journal.track_pages(live_pages, api)))
+                batches = plan_detail_batches(api, pages, planner, catalog, github_repo_dir, on_duplicate)
+                
+                def fetch_batch(job):
+                    batch, include_question = job
+                    # Details journaled as downloaded come back from the store
+                    pending, restored = journal.split(batch, store)
+                    if not pending:
+                        return restored
+                    with METRICS.timer("detail_batch_seconds"), span("detail batch", "fetch", size=len(pending)):
+                        return restored + api.fetch_detail_batch(pending, include_question)
+                
+                detailed_batches = bounded_map_unordered(
+                    executor,
+                    fetch_batch,
+                    batches,
+                    max_in_flight=api.workers * 2
+                )
+                
+                for detailed_batch in detailed_batches:
+                    if not detailed_batch:
+                        continue
+                    detailed_batch = [catalog.annotate(submission) for submission in detailed_batch]
+                    
+                    # Keep everything LeetCode returned so the repo can be re-rendered offline
+                    with METRICS.timer("store_save_seconds"), span("store save", "io", size=len(detailed_batch)):
+                        store.save_submissions(detailed_batch)
+                    
+                    downloaded = [submission for submission in detailed_batch if submission.get("code")]
+                    journal.record_details(submission["id"] for submission in downloaded)
+                    failed_count += len(detailed_batch) - len(downloaded)
+                    METRICS.inc("details_fetched_total", len(downloaded))
+                    METRICS.inc("details_failed_total", len(detailed_batch) - len(downloaded))
+                    
+                    # Duplicates are only downloaded when they are meant to be overwritten
+                    write_start = time.perf_counter()
+                    if backfiller is not None:
+                        batch_saved = import_submissions(downloaded, github_repo_dir, backfiller)
+                    else:
+                        batch_saved, persisted_ids = write_submissions(downloaded, github_repo_dir, writer,
+                                                                       overwrite=True, index=index)
+                        # Only files now on disk count as done; backfilled ones only land when fast-import
+                        # finishes, so those are not journaled
+                        journal.record_written(persisted_ids)
+                        # Files that failed to write hold the cursor back like failed downloads
+                        failed_count += len(downloaded) - len(persisted_ids)
+                    write_seconds += time.perf_counter() - write_start
+                    saved_count += batch_saved
+                    METRICS.inc("submissions_saved_total", batch_saved)
+                
+                mark_phase("details")
+            
+            if backfiller is not None:
+                with METRICS.timer("git_command_seconds", command="fast-import"), span("git fast-import", "git"):
+                    commit_count = backfiller.finish()
+        finally:
+            journal.close()
+            # Record whatever was written, even if the run was interrupted
+            with METRICS.timer("manifest_save_seconds"):
+                index.save()
+            if backfiller is not None:
+                backfiller.abort()
+                backfiller.repo.close()
+            METRICS.observe("sync_seconds", time.perf_counter() - sync_start)
+        
+        mark_phase("writes")
+        
+        # The newest submission and cursor of the whole run, also when listing was replayed
+        api.head_submission = journal.head
+        api.last_key = journal.last_key
+        
+        if not planner.listed:
+            click.echo("ℹ️  No new accepted submissions found")
+            update_sync_state(username, sync_state, api, failed_count)
+            journal.finish()
+            return 0
+        
+        click.echo(f"✅ Found {planner.listed} accepted submissions")
+        
+        avoided_calls = planner.listed - planner.planned
+        if avoided_calls:
+            kept_duplicates = avoided_calls - planner.superseded - planner.unsupported
+            click.echo(f"⏭️  Skipped {avoided_calls} detail downloads ({planner.superseded} older attempts, "
+                       f"{planner.unsupported} unsupported languages, {kept_duplicates} kept duplicates)")
+            logger.info(f"Avoided {avoided_calls} of {planner.listed} submission detail calls")
+        
+        details_requested = api.details_requested - details_requested_start
+        if details_requested:
+            detail_bytes = api.detail_bytes - detail_bytes_start
+            click.echo(f"📦 Downloaded {detail_bytes / 1024:.0f} KB of details with the '{api.detail_profile}' field "
+                       f"profile ({detail_bytes / details_requested / 1024:.1f} KB per submission)")
+            logger.info(f"Detail responses: {detail_bytes} bytes for {details_requested} submissions "
+                        f"({api.detail_profile} fields)")
+        
+        update_sync_state(username, sync_state, api, failed_count)
+        journal.finish()
         
         # Save submissions to GitHub repository directory
-        if submissions_to_save:
-            click.echo(f"\n💾 Saving {len(submissions_to_save)} submissions to {github_repo_dir}...")
-            saved_count = 0
-            
-            for submission in submissions_to_save:
-                if save_submission(submission, github_repo_dir):
-                    saved_count += 1
-            
-            click.echo(f"✅ Successfully saved {saved_count} submissions")
+        if saved_count > 0 and backfiller is not None:
+            click.echo(f"✅ Imported {saved_count} submissions into {commit_count} commits in {github_repo_dir}")
+            logger.info(f"Backfill completed: {saved_count} submissions in {commit_count} commits")
+            click.echo()
+            click.echo("🚀 Next step: Run 'python leetcode_auto_push.py git_push' to push the new commits to GitHub")
+        elif saved_count > 0:
+            click.echo(f"✅ Successfully saved {saved_count} submissions to {github_repo_dir}")
+            click.echo(f"💾 Wrote files in {write_seconds:.2f}s ({saved_count / max(write_seconds, 1e-9):.0f} files/s)")
             logger.info(f"Fetch completed: {saved_count} submissions saved")
-            
-            if saved_count > 0:
-                click.echo()
-                click.echo("🚀 Next step: Run 'python leetcode_auto_push.py git_push' to push changes to GitHub")
+            click.echo()
+            click.echo("🚀 Next step: Run 'python leetcode_auto_push.py git_push' to push changes to GitHub")
         else:
             click.echo("ℹ️  No new submissions to save")
         
+        return saved_count
+        
+    except KeyboardInterrupt:
+        if resume_hint and journal is not None and journal.exists():
+            click.echo(f"\n💡 Progress saved; run 'lcsync fetch --resume --user {username}' to continue", err=True)
+        raise
     except Exception as e:
         error_msg = f"Failed to fetch submissions: {str(e)}"
+        if resume_hint and journal is not None and journal.exists():
+            error_msg += f"\n\n💡 Progress saved; run 'lcsync fetch --resume --user {username}' to continue"
         logger.error(error_msg)
         click.echo(f"❌ {error_msg}", err=True)
-        raise click.ClickException(error_msg)
\ No newline at end of file
+        raise click.ClickException(error_msg) from e
@@ -4,22 +4,97 @@ Bundle git add, commit, push operations
 """
 
 import logging
-import os
 import subprocess
 from pathlib import Path
 
 import click
 
+from .git_repo import GitRepo
+from .manifest import clear_pending_paths, get_pending_paths_mark, read_pending_paths
+from .profiling import mark_phase
 from .set_user import get_user_config
 
 
-def git_push(custom_message=None):
-    """Bundle git add, commit, push operations"""
+def get_changed_paths(repo: GitRepo, paths):
+    """
+    Keep only the pending paths whose content differs from HEAD
+    Rewritten-but-identical files and files written and deleted again
+    without being committed are dropped, using in-process blob hashes
+    checked against one long-lived cat-file process.
+    """
+    return [path for path in paths if not repo.is_unchanged(path)]
+
+def stage_and_commit(repo: GitRepo, repo_path: Path, commit_message: str) -> bool:
+    """
+    Stage the files written since the last commit and commit them
+    Returns True if a commit was made
+    """
+    logger = logging.getLogger()
+    
+    # Step 1: stage the files fetch wrote, or everything if we don't know what changed
+    # Paths a concurrent fetch appends past the mark are kept for the next commit
+    pending_mark = get_pending_paths_mark(repo_path)
+    pending_paths = read_pending_paths(repo_path)
+    
+    if pending_paths is None:
+        click.echo("📝 Running: git add .")
+        result = repo.run("add", ".")
+    else:
+        pending_paths = get_changed_paths(repo, pending_paths)
+        if not pending_paths:
+            clear_pending_paths(repo_path, pending_mark)
+            click.echo("ℹ️  No changes to commit")
+            logger.info("No changes to commit: no files changed since the last commit")
+            return False
+        
+        click.echo(f"📝 Running: git add ({len(pending_paths)} files changed since the last commit)")
+        result = repo.run("add", "--pathspec-from-file=-", input="\n".join(pending_paths) + "\n")
+    
+    if result.returncode != 0:
+        error_msg = f"git add failed: {result.stderr}"
+        logger.error(error_msg)
+        raise click.ClickException(error_msg)
+    
+    logger.info("git add completed successfully")
+    click.echo("✅ git add completed")
+    
+    # Check if there are any changes to commit; staged pending paths are known to differ from HEAD
+    if pending_paths is None and repo.run("diff", "--cached", "--quiet").returncode == 0:
+        click.echo("ℹ️  No changes to commit")
+        logger.info("No changes to commit")
+        return False
+    
+    # Step 2: git commit
+    click.echo(f"💾 Running: git commit -m \"{commit_message}\"")
+    result = repo.run("commit", "-m", commit_message)
+    
+    if result.returncode != 0:
+        error_msg = f"git commit failed: {result.stderr}"
+        logger.error(error_msg)
+        raise click.ClickException(error_msg)
+    
+    logger.info(f"git commit completed: {commit_message}")
+    click.echo("✅ git commit completed")
+    clear_pending_paths(repo_path, pending_mark)
+    mark_phase("commit")
+    
+    return True
+
+def has_unpushed_commits(repo: GitRepo) -> bool:
+    """Whether the current branch is ahead of its upstream, e.g. after a backfill"""
+    result = repo.run("rev-list", "--count", "@{u}..HEAD")
+    return result.returncode == 0 and int(result.stdout.strip() or 0) > 0
+
+def git_push(custom_message=None, username=None):
+    """
+    Bundle git add, commit, push operations
+    Returns True if anything was pushed
+    """
     logger = logging.getLogger()
     
     try:
         # Get user configuration
-        username, config = get_user_config()
+        username, config = get_user_config(username)
         
         repo_path = Path(config["GITHUB_REPO_DIR"])
         
@@ -42,66 +117,13 @@ def git_push(custom_message=None):
         if not git_dir.exists():
             raise click.ClickException(f"Not a Git repository: {repo_path}")
         
-        # Change to repository directory
-        original_cwd = os.getcwd()
-        os.chdir(repo_path)
-        
-        try:
-            # Step 1: git add .
-            click.echo("📝 Running: git add .")
-            result = subprocess.run(
-                ["git", "add", "."],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            
-            if result.returncode != 0:
-                error_msg = f"git add failed: {result.stderr}"
-                logger.error(error_msg)
-                raise click.ClickException(error_msg)
-            
-            logger.info("git add completed successfully")
-            click.echo("✅ git add completed")
-            
-            # Check if there are any changes to commit
-            result = subprocess.run(
-                ["git", "diff", "--cached", "--quiet"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            
-            if result.returncode == 0:
-                click.echo("ℹ️  No changes to commit")
-                logger.info("No changes to commit")
-                return
-            
-            # Step 2: git commit
-            click.echo(f"💾 Running: git commit -m \"{commit_message}\"")
-            result = subprocess.run(
-                ["git", "commit", "-m", commit_message],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            
-            if result.returncode != 0:
-                error_msg = f"git commit failed: {result.stderr}"
-                logger.error(error_msg)
-                raise click.ClickException(error_msg)
-            
-            logger.info(f"git commit completed: {commit_message}")
-            click.echo("✅ git commit completed")
+        with GitRepo(repo_path) as repo:
+            if not stage_and_commit(repo, repo_path, commit_message) and not has_unpushed_commits(repo):
+                return False
             
             # Step 3: git push
             click.echo("🚀 Running: git push")
-            result = subprocess.run(
-                ["git", "push"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
+            result = repo.run("push")
             
             if result.returncode != 0:
                 error_msg = f"git push failed: {result.stderr}"
@@ -122,13 +144,11 @@ def git_push(custom_message=None):
             
             logger.info("git push completed successfully")
             click.echo("✅ git push completed")
+            mark_phase("push")
             
             click.echo()
             click.echo("🎉 All Git operations completed successfully!")
-            
-        finally:
-            # Always restore original working directory
-            os.chdir(original_cwd)
+            return True
         
     except subprocess.CalledProcessError as e:
         error_msg = f"Git command failed: {e}"
@@ -144,31 +164,17 @@ def git_push(custom_message=None):
 def check_git_status(repo_path):
     """Check git status and return info about uncommitted changes"""
     try:
-        original_cwd = os.getcwd()
-        os.chdir(repo_path)
+        with GitRepo(repo_path) as repo:
+            lines = repo.status()
         
-        try:
-            # Check for uncommitted changes
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            lines = result.stdout.strip().split('\n') if result.stdout.strip() else []
-            
-            if lines:
-                return {
-                    "has_changes": True,
-                    "num_changes": len(lines),
-                    "changes": lines
-                }
-            else:
-                return {"has_changes": False, "num_changes": 0, "changes": []}
-                
-        finally:
-            os.chdir(original_cwd)
+        if lines:
+            return {
+                "has_changes": True,
+                "num_changes": len(lines),
+                "changes": lines
+            }
+        else:
+            return {"has_changes": False, "num_changes": 0, "changes": []}
             
     except subprocess.CalledProcessError:
-        return {"has_changes": False, "num_changes": 0, "changes": [], "error": True}
\ No newline at end of file
+        return {"has_changes": False, "num_changes": 0, "changes": [], "error": True}
@@ -0,0 +1,132 @@
+"""
+Git repository handle
+Runs git against a repository with `git -C`, without changing the process working directory
+"""
+
+import hashlib
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .metrics import METRICS
+from .tracing import add_span
+
+
+class GitRepo:
+    """
+    Handle on one git repository
+
+    Every command runs with `git -C <path>`, so several repositories can be
+    used from one process at the same time. Object lookups go through a
+    long-lived `git cat-file --batch-check` process, started on first use,
+    so per-file queries do not spawn a process each.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._batch_check = None
+        self._object_format = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Stop the cat-file process"""
+        with self._lock:
+            if self._batch_check is not None and self._batch_check.poll() is None:
+                self._batch_check.stdin.close()
+                self._batch_check.wait()
+            self._batch_check = None
+
+    def run(self, *args: str, input: str = None) -> subprocess.CompletedProcess:
+        """Run a git command in the repository and capture its output, timing it per subcommand"""
+        start = time.perf_counter()
+        result = subprocess.run(
+            ["git", "-C", str(self.path), *args],
+            input=input,
+            capture_output=True,
+            text=True,
+            check=False
+        )
+        end = time.perf_counter()
+        METRICS.observe("git_command_seconds", end - start, command=args[0])
+        add_span(f"git {args[0]}", "git", start, end, returncode=result.returncode)
+        if result.returncode != 0:
+            METRICS.inc("git_command_failures_total", command=args[0])
+        return result
+
+    @property
+    def object_format(self) -> str:
+        """Hash algorithm of the repository's objects (sha1 or sha256)"""
+        if self._object_format is None:
+            result = self.run("rev-parse", "--show-object-format")
+            self._object_format = result.stdout.strip() if result.returncode == 0 and result.stdout.strip() else "sha1"
+        return self._object_format
+
+    def _start_cat_file(self) -> subprocess.Popen:
+        return subprocess.Popen(
+            ["git", "-C", str(self.path), "cat-file", "--batch-check"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+
+    @staticmethod
+    def _send(process: subprocess.Popen, rev: str) -> Optional[Tuple[str, str, int]]:
+        """Ask a cat-file process about one object and parse its header line"""
+        process.stdin.write(rev.encode('utf-8') + b"\n")
+        process.stdin.flush()
+        header = process.stdout.readline().decode('utf-8').split()
+        if len(header) != 3:
+            # "<rev> missing" or "<rev> ambiguous"
+            return None
+        object_id, object_type, size = header
+        return object_id, object_type, int(size)
+
+    def object_info(self, rev: str) -> Optional[Tuple[str, str, int]]:
+        """(object id, type, size) of a revision such as HEAD:path, or None if it does not exist"""
+        METRICS.inc("git_object_lookups_total")
+        with self._lock:
+            if self._batch_check is None:
+                self._batch_check = self._start_cat_file()
+            return self._send(self._batch_check, rev)
+
+    def blob_id(self, content: bytes) -> str:
+        """Object id git would give a blob with this content, computed in-process"""
+        digest = hashlib.new(self.object_format)
+        digest.update(b"blob %d\0" % len(content))
+        digest.update(content)
+        return digest.hexdigest()
+
+    def head_blob_id(self, path: str) -> Optional[str]:
+        """Object id of a file in HEAD, or None if it is not tracked there"""
+        info = self.object_info(f"HEAD:{path}")
+        return info[0] if info is not None else None
+
+    def is_unchanged(self, path: str) -> bool:
+        """
+        Whether a working tree file has the same content as in HEAD
+        A file missing from both counts as unchanged. Content filters
+        (autocrlf, clean filters) are not applied, so a filtered file may
+        be reported as changed and is simply staged as usual.
+        """
+        head_id = self.head_blob_id(path)
+        file_path = self.path / path
+        if not file_path.exists():
+            return head_id is None
+        if head_id is None:
+            return False
+        return self.blob_id(file_path.read_bytes()) == head_id
+
+    def status(self) -> List[str]:
+        """`git status --porcelain` lines for uncommitted changes"""
+        result = self.run("status", "--porcelain")
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, "git status", result.stdout, result.stderr)
+        return result.stdout.strip().split('\n') if result.stdout.strip() else []
@@ -208,6 +208,9 @@ Thumbs.db
 users/
 !users/.gitignore
 
+# Cached LeetCode data
+cache/
+
 # Logs
 *.log
 """
@@ -0,0 +1,211 @@
+"""
+Fetch journal implementation
+Durable record of an in-progress fetch, so an interrupted run can be resumed
+"""
+
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Stored as users/<username>.journal next to the sync state
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_VERSION = 1
+
+
+def get_journal_path(username: str) -> Path:
+    """Get the path of the fetch journal for a user"""
+    return Path.cwd() / "users" / f"{username}{JOURNAL_SUFFIX}"
+
+
+class FetchJournal:
+    """
+    Append-only JSON lines log of one fetch run
+
+    Records where the run started, every listed page (its accepted
+    submissions and the cursor after it), the submission ids whose details
+    are in the SubmissionStore and the ids whose files were written. Each
+    record is flushed as soon as it is made and a torn last line is dropped
+    on load, so everything recorded before a crash, a failed request or a
+    Ctrl-C is skipped by fetch --resume. A journal damaged anywhere else is
+    not trusted. The file is removed when a run completes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.since_id = None
+        self.backfill = False
+        self.commit_per_problem = False
+        self.started_at = None
+        self.pages = []
+        self.next_offset = 0
+        self.last_key = None
+        self.head = None
+        self.listed = False
+        self.completed = set()
+        self.written = set()
+        self._valid_bytes = 0
+        self._file = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> bool:
+        """
+        Replay the journal file into this object
+        Returns False if there is no usable journal
+        """
+        logger = logging.getLogger()
+
+        if not self.path.exists():
+            return False
+
+        try:
+            with open(self.path, 'rb') as f:
+                lines = f.readlines()
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable fetch journal {self.path}: {e}")
+            return False
+
+        for line_number, line in enumerate(lines, 1):
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("no line end")
+                record = json.loads(line.decode('utf-8'))
+            except ValueError:
+                if line_number == len(lines):
+                    # A crash mid-write can only tear the last record; reopen() cuts it off
+                    logger.warning(f"Dropping the incomplete last record of {self.path.name}")
+                    break
+                logger.warning(f"Ignoring fetch journal {self.path}: record {line_number} of {len(lines)} is corrupt")
+                return False
+            self._apply(record, keep_pages=True)
+            self._valid_bytes += len(line)
+
+        if self.started_at is None:
+            logger.warning(f"Ignoring fetch journal {self.path} without a start record")
+            return False
+        return True
+
+    def _apply(self, record: Dict, keep_pages: bool = False):
+        event = record.get("event")
+        if event == "start":
+            if record.get("version") != JOURNAL_VERSION:
+                return
+            self.since_id = record.get("since_id")
+            self.backfill = record.get("backfill", False)
+            self.commit_per_problem = record.get("commit_per_problem", False)
+            self.started_at = record.get("started_at")
+        elif event == "page":
+            # Pages are only replayed from a loaded journal; a live run need not hold them
+            if keep_pages:
+                self.pages.append(record["submissions"])
+            self.next_offset = record["next_offset"]
+            self.last_key = record.get("last_key")
+            if self.head is None:
+                self.head = record.get("head")
+        elif event == "listed":
+            self.listed = True
+        elif event == "details":
+            self.completed.update(record["ids"])
+        elif event == "written":
+            self.written.update(record["ids"])
+
+    def _append(self, record: Dict):
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            # Reaches the OS right away, so it survives the process dying
+            self._file.flush()
+            self._apply(record)
+
+    def start(self, since_id: Optional[int], backfill: bool, commit_per_problem: bool):
+        """Begin a new journal, replacing any previous one"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._append({
+            "event": "start",
+            "version": JOURNAL_VERSION,
+            "since_id": since_id,
+            "backfill": backfill,
+            "commit_per_problem": commit_per_problem,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+        })
+
+    def reopen(self):
+        """Keep appending to a loaded journal, after the last complete record"""
+        with open(self.path, 'r+b') as f:
+            f.truncate(self._valid_bytes)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def record_page(self, submissions: List[Dict], next_offset: int, last_key: Optional[str], head: Optional[Dict]):
+        self._append({"event": "page", "submissions": submissions, "next_offset": next_offset,
+                      "last_key": last_key, "head": head})
+
+    def record_listed(self):
+        self._append({"event": "listed"})
+
+    def record_details(self, submission_ids: Iterable[str]):
+        submission_ids = [submission_id for submission_id in submission_ids if submission_id not in self.completed]
+        if submission_ids:
+            self._append({"event": "details", "ids": submission_ids})
+
+    def record_written(self, submission_ids: Iterable[str]):
+        submission_ids = [submission_id for submission_id in submission_ids if submission_id not in self.written]
+        if submission_ids:
+            self._append({"event": "written", "ids": submission_ids})
+
+    def track_pages(self, pages: Iterator[List[Dict]], api) -> Iterator[List[Dict]]:
+        """
+        Pass listed pages through, recording each with the api's cursor
+        Must wrap api.iter_accepted_pages() directly, in the thread that runs it
+        """
+        for page in pages:
+            self.record_page(page, api.next_offset, api.last_key, api.head_submission)
+            yield page
+        self.record_listed()
+
+    def split(self, submissions: List[Dict], store) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Split a detail batch into submissions still to download and ones
+        restored from the store; submissions whose files were already
+        written are dropped. Returns (pending, restored)
+        """
+        done_ids = [sub["id"] for sub in submissions if sub["id"] in self.completed and sub["id"] not in self.written]
+        stored = store.get_submissions(done_ids) if done_ids else {}
+
+        pending, restored = [], []
+        for submission in submissions:
+            if submission["id"] in self.written:
+                continue
+            if submission["id"] in stored:
+                restored.append(stored[submission["id"]])
+            else:
+                # Also covers ids journaled as done whose store write never landed
+                pending.append(submission)
+        return pending, restored
+
+    def summary(self) -> str:
+        listing = "listing done" if self.listed else f"{len(self.pages)} pages listed"
+        return f"{listing}, {len(self.completed)} details downloaded, {len(self.written)} files written"
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def finish(self):
+        """Close and remove the journal once the run has completed"""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
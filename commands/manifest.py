@@ -0,0 +1,362 @@
+"""
+Solutions index implementation
+Persistent manifest of the solution files in the target repository
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows - only the threads of one process are serialized there
+    fcntl = None
+
+# Kept inside the target repo's .git directory so it is never committed
+MANIFEST_DIR = "lcsync"
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Paths written since the last commit, staged by git_push
+PENDING_PATHS_FILE = "pending-paths"
+_PENDING_PATHS_LOCK = threading.Lock()
+
+SOLUTIONS_DIR = "leetcodeProblems"
+
+
+def get_git_dir(repo_dir: Path) -> Path:
+    """Get the .git directory of a repository, following worktree .git files"""
+    git_path = Path(repo_dir) / ".git"
+    if git_path.is_file():
+        content = git_path.read_text(encoding='utf-8').strip()
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:"):].strip())
+            return git_dir if git_dir.is_absolute() else (Path(repo_dir) / git_dir).resolve()
+    return git_path
+
+
+def get_manifest_path(repo_dir: Path) -> Path:
+    """Get the path of the solutions manifest for a target repository"""
+    return get_git_dir(repo_dir) / MANIFEST_DIR / MANIFEST_FILE
+
+
+def get_pending_paths_path(repo_dir: Path) -> Path:
+    """Get the path of the list of files written since the last commit"""
+    return get_git_dir(repo_dir) / MANIFEST_DIR / PENDING_PATHS_FILE
+
+
+@contextmanager
+def lock_pending_paths(repo_dir: Path):
+    """
+    Hold the pending paths list against concurrent appends and clears
+    Threads of this process (watch fetching while it pushes) share one
+    lock; other processes are kept out with flock where it is available.
+    """
+    with _PENDING_PATHS_LOCK:
+        lock_path = get_pending_paths_path(repo_dir).with_suffix(".lock")
+        if fcntl is None or not lock_path.parent.is_dir():
+            yield
+            return
+
+        with open(lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def add_pending_paths(repo_dir: Path, paths: Iterable[str]):
+    """Append repo-relative paths to the pending paths list"""
+    paths = sorted(paths)
+    pending_path = get_pending_paths_path(repo_dir)
+    if not paths or not pending_path.parent.parent.is_dir():
+        return
+
+    pending_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_pending_paths(repo_dir), open(pending_path, 'a', encoding='utf-8') as f:
+        f.write("".join(f"{path}\n" for path in paths))
+
+
+def get_pending_paths_mark(repo_dir: Path) -> int:
+    """
+    Current end of the pending paths list, for clear_pending_paths
+    Take it before read_pending_paths: paths appended after the mark
+    survive the clear, so a push never drops files written while it ran
+    """
+    pending_path = get_pending_paths_path(repo_dir)
+    with lock_pending_paths(repo_dir):
+        return pending_path.stat().st_size if pending_path.exists() else 0
+
+
+def read_pending_paths(repo_dir: Path) -> Optional[List[str]]:
+    """
+    Get the unique paths written since the last commit
+    Returns None if no list exists yet, meaning nothing is known about the tree
+    """
+    pending_path = get_pending_paths_path(repo_dir)
+    if not pending_path.exists():
+        return None
+
+    with lock_pending_paths(repo_dir), open(pending_path, 'r', encoding='utf-8') as f:
+        return list(dict.fromkeys(line.strip() for line in f if line.strip()))
+
+
+def clear_pending_paths(repo_dir: Path, mark: int = None):
+    """
+    Drop the pending paths up to mark (from get_pending_paths_mark) once
+    their files are committed, or the whole list without a mark
+    """
+    pending_path = get_pending_paths_path(repo_dir)
+    if not pending_path.exists():
+        return
+
+    with lock_pending_paths(repo_dir):
+        with open(pending_path, 'rb') as f:
+            remaining = f.read()[mark:] if mark is not None else b""
+        with open(pending_path, 'wb') as f:
+            f.write(remaining)
+
+
+def hash_bytes(content: bytes) -> str:
+    """Content hash stored in the manifest"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def hash_file(file_path: Path) -> str:
+    """Hash a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SolutionIndex:
+    """
+    Index of solution files keyed by (titleSlug, extension)
+
+    Each entry records slug, lang, difficulty, path, content hash, mtime
+    and size. The manifest is persisted under .git/lcsync/ and validated
+    against the mtime of each difficulty directory: only directories whose
+    mtime changed (a file was added, removed or renamed) are rescanned, so
+    an unchanged tree costs one stat per directory instead of a listing.
+    Hashes are computed lazily and reused while a file's mtime and size
+    are unchanged. Files written or removed through the index are added
+    to the pending paths list on save, for git_push to stage.
+    """
+
+    def __init__(self, repo_dir: Path, language_extensions: Dict[str, str]):
+        self.repo_dir = Path(repo_dir)
+        self.path = get_manifest_path(self.repo_dir)
+        self.extensions = set(language_extensions.values())
+        self.default_langs = {}
+        for lang, extension in language_extensions.items():
+            self.default_langs.setdefault(extension, lang)
+
+        self.entries = {}
+        self.dir_mtimes = {}
+        self.changed_paths = set()
+        self.rescanned_dirs = 0
+        self.dirty = False
+        self._lock = threading.RLock()
+
+        self.load()
+        self.validate()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self.entries
+
+    def load(self):
+        """Load the manifest, starting empty if it is missing, unreadable or outdated"""
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                return
+            self.dir_mtimes = data.get("dirs", {})
+            for entry in data.get("entries", []):
+                self.entries[(entry["slug"], Path(entry["path"]).suffix)] = entry
+        except Exception as e:
+            logging.getLogger().warning(f"Ignoring unreadable solutions manifest {self.path}: {e}")
+            self.entries = {}
+            self.dir_mtimes = {}
+
+    def save(self):
+        """Write the manifest if anything changed, and queue changed files for git_push"""
+        with self._lock:
+            add_pending_paths(self.repo_dir, self.changed_paths)
+            self.changed_paths = set()
+
+            if not self.dirty or not self.path.parent.parent.is_dir():
+                return
+
+            data = {
+                "version": MANIFEST_VERSION,
+                "dirs": self.dir_mtimes,
+                "entries": sorted(self.entries.values(), key=lambda entry: entry["path"]),
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+            self.dirty = False
+
+    def validate(self):
+        """Rescan the difficulty directories whose mtime no longer matches the manifest"""
+        solutions_dir = self.repo_dir / SOLUTIONS_DIR
+        current_dirs = {}
+        if solutions_dir.is_dir():
+            for difficulty_dir in solutions_dir.iterdir():
+                if difficulty_dir.is_dir():
+                    current_dirs[difficulty_dir.name] = difficulty_dir.stat().st_mtime_ns
+
+        with self._lock:
+            for difficulty in set(self.dir_mtimes) | set(current_dirs):
+                if self.dir_mtimes.get(difficulty) != current_dirs.get(difficulty):
+                    self._rescan(difficulty, current_dirs.get(difficulty))
+
+        if self.rescanned_dirs:
+            logging.getLogger().info(f"Solutions manifest: rescanned {self.rescanned_dirs} changed directories")
+
+    def _rescan(self, difficulty: str, dir_mtime: Optional[int]):
+        """Rebuild the entries of one difficulty directory, keeping hashes of unchanged files"""
+        previous = {entry["path"]: entry for entry in self.entries.values() if entry["difficulty"] == difficulty}
+        for entry in previous.values():
+            del self.entries[(entry["slug"], Path(entry["path"]).suffix)]
+
+        if dir_mtime is None:
+            self.dir_mtimes.pop(difficulty, None)
+        else:
+            with os.scandir(self.repo_dir / SOLUTIONS_DIR / difficulty) as it:
+                for dir_entry in it:
+                    extension = os.path.splitext(dir_entry.name)[1]
+                    if extension not in self.extensions or not dir_entry.is_file():
+                        continue
+
+                    stat = dir_entry.stat()
+                    relative_path = f"{SOLUTIONS_DIR}/{difficulty}/{dir_entry.name}"
+                    entry = previous.get(relative_path)
+                    if entry is None or entry["mtime"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                        entry = {
+                            "slug": dir_entry.name[:-len(extension)],
+                            "lang": self.default_langs[extension],
+                            "difficulty": difficulty,
+                            "path": relative_path,
+                            "hash": None,
+                            "mtime": stat.st_mtime_ns,
+                            "size": stat.st_size,
+                        }
+                    self.entries[(entry["slug"], extension)] = entry
+            self.dir_mtimes[difficulty] = dir_mtime
+
+        self.rescanned_dirs += 1
+        self.dirty = True
+
+    def get(self, title_slug: str, extension: str) -> Optional[Dict]:
+        """Get the manifest entry for a problem and extension, or None"""
+        return self.entries.get((title_slug, extension))
+
+    def get_hash(self, title_slug: str, extension: str) -> Optional[str]:
+        """
+        Content hash of the file on disk for a problem and extension, or None
+        The file is stat'ed first, since editing a file in place does not
+        change its directory's mtime
+        """
+        with self._lock:
+            entry = self.get(title_slug, extension)
+            if entry is None:
+                return None
+
+        try:
+            stat = (self.repo_dir / entry["path"]).stat()
+        except OSError:
+            return None
+
+        with self._lock:
+            if entry["hash"] is not None and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                return entry["hash"]
+
+        # Hash outside the lock so concurrent writers are not serialized on disk reads
+        try:
+            file_hash = hash_file(self.repo_dir / entry["path"])
+        except OSError:
+            return None
+
+        with self._lock:
+            entry.update({"hash": file_hash, "mtime": stat.st_mtime_ns, "size": stat.st_size})
+            self.dirty = True
+        return file_hash
+
+    def record(self, file_path: Path, title_slug: str, lang: str, content: bytes):
+        """Record a file that was just written"""
+        file_path = Path(file_path)
+        stat = file_path.stat()
+        difficulty = file_path.parent.name
+
+        relative_path = file_path.relative_to(self.repo_dir).as_posix()
+
+        with self._lock:
+            self.entries[(title_slug, file_path.suffix)] = {
+                "slug": title_slug,
+                "lang": lang,
+                "difficulty": difficulty,
+                "path": relative_path,
+                "hash": hash_bytes(content),
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+            }
+            self.changed_paths.add(relative_path)
+            # The write itself may have bumped the directory mtime
+            self.dir_mtimes[difficulty] = file_path.parent.stat().st_mtime_ns
+            self.dirty = True
+
+    def remove(self, file_path: Path):
+        """Forget a file that was deleted; an entry for another copy of the same problem is kept"""
+        file_path = Path(file_path)
+        relative_path = file_path.relative_to(self.repo_dir).as_posix()
+        key = (file_path.name[:-len(file_path.suffix)], file_path.suffix)
+
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry["path"] == relative_path:
+                del self.entries[key]
+            self.changed_paths.add(relative_path)
+            if file_path.parent.is_dir():
+                self.dir_mtimes[file_path.parent.name] = file_path.parent.stat().st_mtime_ns
+            self.dirty = True
+
+    def iter_files(self) -> Iterator[Tuple[str, str, Path]]:
+        """
+        Yield (slug, extension, path) for every solution file on disk
+        Unlike the entries, this includes copies of one problem left in
+        several difficulty directories
+        """
+        solutions_dir = self.repo_dir / SOLUTIONS_DIR
+        if not solutions_dir.is_dir():
+            return
+
+        for difficulty_dir in sorted(solutions_dir.iterdir()):
+            if not difficulty_dir.is_dir():
+                continue
+            for file_path in sorted(difficulty_dir.iterdir()):
+                if file_path.suffix in self.extensions and file_path.is_file():
+                    yield file_path.name[:-len(file_path.suffix)], file_path.suffix, file_path
+
+    def iter_entries(self) -> Iterator[Dict]:
+        """Yield every manifest entry"""
+        with self._lock:
+            entries = list(self.entries.values())
+        yield from entries
@@ -0,0 +1,282 @@
+"""
+Run metrics implementation
+Counters and latency histograms for one lcsync run, reported as JSON or Prometheus text
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+# Every run appends its report here, one JSON object per line
+METRICS_DIR = Path("cache") / "metrics"
+RUN_LOG_FILE = "runs.jsonl"
+
+# Prefix of every metric name in the Prometheus textfile
+PROMETHEUS_PREFIX = "lcsync_"
+
+# Histogram bucket upper bounds in seconds; a final +Inf bucket is implied
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Quantiles estimated from the buckets in the JSON report
+REPORT_QUANTILES = (0.5, 0.9, 0.99)
+
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def format_key(key: MetricKey) -> str:
+    """Render a metric key as name{label="value",...}"""
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{label}="{value}"' for label, value in labels) + "}"
+
+
+class Histogram:
+    """Latency distribution over fixed buckets, with count, sum, min and max"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def cumulative_counts(self) -> Iterator[Tuple[float, int]]:
+        """(upper bound, observations at or below it), ending with +Inf"""
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls in, capped at max"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, total in self.cumulative_counts():
+            if total >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        report = {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "min": round(self.min or 0.0, 6),
+            "max": round(self.max or 0.0, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+        }
+        for q in REPORT_QUANTILES:
+            report[f"p{int(q * 100)}"] = round(self.quantile(q), 6)
+        report["buckets"] = {
+            ("+Inf" if bound == float("inf") else repr(bound)): total
+            for bound, total in self.cumulative_counts()
+        }
+        return report
+
+
+class Metrics:
+    """
+    Thread-safe registry of counters and histograms
+
+    Metrics are identified by a name plus optional labels, e.g.
+    inc("api_requests_total", operation="list"). Recording is a lock and a
+    few additions, so instrumented code records unconditionally.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop everything recorded so far"""
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, str]) -> MetricKey:
+        return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Add to a counter"""
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record one duration in a histogram"""
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Time the body of a with block into a histogram, including when it raises"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter(self, name: str, **labels) -> float:
+        """Current value of a counter (0 if never incremented)"""
+        with self._lock:
+            return self.counters.get(self._key(name, labels), 0)
+
+    def total(self, name: str) -> float:
+        """Sum of a counter over all its labels"""
+        with self._lock:
+            return sum(value for (counter_name, _), value in self.counters.items() if counter_name == name)
+
+    def snapshot(self) -> Dict:
+        """Counters and histogram summaries keyed by name{labels}"""
+        with self._lock:
+            return {
+                "counters": {format_key(key): value for key, value in sorted(self.counters.items())},
+                "histograms": {format_key(key): histogram.to_dict()
+                               for key, histogram in sorted(self.histograms.items())},
+            }
+
+    def to_prometheus(self, run_labels: Dict[str, str] = None) -> str:
+        """Everything recorded, in the Prometheus text exposition format"""
+        run_labels = tuple(sorted((run_labels or {}).items()))
+        lines = []
+
+        def sample(name, labels, value):
+            lines.append(f"{format_key((PROMETHEUS_PREFIX + name, run_labels + labels))} {value}")
+
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} counter")
+                    typed.add(name)
+                sample(name, labels, value)
+
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} histogram")
+                    typed.add(name)
+                for bound, total in histogram.cumulative_counts():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    sample(f"{name}_bucket", labels + (("le", le),), total)
+                sample(f"{name}_sum", labels, round(histogram.sum, 6))
+                sample(f"{name}_count", labels, histogram.count)
+
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry every instrumented module records into
+METRICS = Metrics()
+
+
+def build_run_report(command: str, started_at: float, duration: float, status: str) -> Dict:
+    """JSON-ready report of one run: what ran, how long it took and everything recorded"""
+    report = {
+        "command": command,
+        "started_at": datetime.fromtimestamp(started_at, timezone.utc).isoformat(),
+        "duration_seconds": round(duration, 3),
+        "status": status,
+    }
+    report.update(METRICS.snapshot())
+
+    duration = max(duration, 1e-9)
+    report["throughput"] = {
+        "submissions_saved_per_second": round(METRICS.total("submissions_saved_total") / duration, 3),
+        "api_requests_per_second": round(METRICS.total("api_requests_total") / duration, 3),
+    }
+    return report
+
+
+def write_text_atomic(path: Path, text: str):
+    """Replace a file in one rename, so scrapers never read half a file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+class MetricsRun:
+    """One metered command run: writes the Prometheus textfile and the JSON run report"""
+
+    def __init__(self, command: str, prometheus_file: str = None):
+        self.command = command
+        self.prometheus_file = Path(prometheus_file) if prometheus_file else None
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+
+    def checkpoint(self):
+        """Refresh the Prometheus textfile with everything recorded so far"""
+        if self.prometheus_file is None:
+            return
+
+        lines = [METRICS.to_prometheus({"command": self.command}).rstrip("\n")]
+        gauges = {
+            "run_duration_seconds": round(time.perf_counter() - self._start, 3),
+            "run_last_update_timestamp_seconds": round(time.time(), 3),
+        }
+        for name, value in gauges.items():
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}{name} gauge")
+            lines.append(f'{PROMETHEUS_PREFIX}{name}{{command="{self.command}"}} {value}')
+        try:
+            write_text_atomic(self.prometheus_file, "\n".join(line for line in lines if line) + "\n")
+        except OSError as e:
+            logging.getLogger().warning(f"Could not write Prometheus metrics to {self.prometheus_file}: {e}")
+
+    def finish(self, status: str) -> Dict:
+        """Append the run report to cache/metrics/runs.jsonl and write the textfile one last time"""
+        report = build_run_report(self.command, self.started_at, time.perf_counter() - self._start, status)
+
+        METRICS_DIR.mkdir(parents=True, exist_ok=True)
+        with open(METRICS_DIR / RUN_LOG_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(report, ensure_ascii=False) + "\n")
+
+        self.checkpoint()
+        return report
+
+
+@contextmanager
+def record_run(command: str, prometheus_file: str = None) -> Iterator[MetricsRun]:
+    """
+    Meter one command run
+    Starts from an empty registry and writes the report when the block
+    exits, with status ok, failed or interrupted.
+    """
+    METRICS.reset()
+    run = MetricsRun(command, prometheus_file)
+    status = "failed"
+    try:
+        yield run
+        status = "ok"
+    except KeyboardInterrupt:
+        status = "interrupted"
+        raise
+    finally:
+        try:
+            run.finish(status)
+        except OSError as e:
+            logging.getLogger().warning(f"Could not write run metrics: {e}")
@@ -0,0 +1,125 @@
+"""
+All-users implementation
+Run fetch, git push or both for every configured user concurrently and summarize the results
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import click
+
+from .defaults import DEFAULT_MAX_PARALLEL
+from .set_user import get_user_config, list_usernames
+
+
+def group_users_by_repo(usernames: List[str]) -> List[List[str]]:
+    """
+    Group users that share a target repository
+    Users in one group run one after another, since they write the same tree
+    """
+    groups = {}
+    for username in usernames:
+        _, config = get_user_config(username)
+        repo_dir = Path(config["GITHUB_REPO_DIR"]).expanduser().resolve()
+        groups.setdefault(repo_dir, []).append(username)
+    return list(groups.values())
+
+
+def run_for_all_users(action: str, run_user: Callable[[str], object],
+                      max_parallel: int = DEFAULT_MAX_PARALLEL) -> List[Dict]:
+    """
+    Call run_user(username) for every configured user, at most max_parallel at a time
+    Each call gets its own API client, session and rate limiter, so users
+    neither share connections nor each other's request budget.
+    Returns one result per user: username, ok, result or error, and seconds taken
+    """
+    logger = logging.getLogger()
+    usernames = list_usernames()
+    groups = group_users_by_repo(usernames)
+
+    click.echo(f"👥 Running {action} for {len(usernames)} users ({min(max_parallel, len(groups))} at a time)")
+    click.echo()
+
+    def run_group(group: List[str]) -> List[Dict]:
+        results = []
+        for username in group:
+            start_time = time.perf_counter()
+            try:
+                result = run_user(username)
+                results.append({"username": username, "ok": True, "result": result})
+            except Exception as e:
+                message = e.format_message() if isinstance(e, click.ClickException) else str(e)
+                logger.error(f"{action} failed for {username}: {message}")
+                results.append({"username": username, "ok": False, "error": message})
+            results[-1]["seconds"] = time.perf_counter() - start_time
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel), thread_name_prefix="lcsync-user") as executor:
+        group_results = list(executor.map(run_group, groups))
+
+    results = [result for group in group_results for result in group]
+    return sorted(results, key=lambda result: usernames.index(result["username"]))
+
+
+def print_summary(action: str, results: List[Dict], describe: Callable[[object], str]):
+    """Print per-user timings and failures, raising if any user failed"""
+    failed = [result for result in results if not result["ok"]]
+
+    click.echo()
+    click.echo(f"📊 {action} summary")
+    width = max(len(result["username"]) for result in results)
+    for result in results:
+        status = f"✅ {describe(result['result'])}" if result["ok"] else f"❌ {result['error']}"
+        click.echo(f"  {result['username']:<{width}}  {result['seconds']:7.1f}s  {status}")
+
+    logging.getLogger().info(f"{action} for all users: {len(results) - len(failed)} succeeded, {len(failed)} failed")
+    if failed:
+        raise click.ClickException(f"{action} failed for {len(failed)} of {len(results)} users: "
+                                   f"{', '.join(result['username'] for result in failed)}")
+
+
+def fetch_all_users(max_parallel: int = DEFAULT_MAX_PARALLEL, on_duplicate: str = "skip",
+                    push: bool = False, custom_message: str = None, **fetch_options):
+    """
+    Fetch submissions for every configured user concurrently
+    With push, each user's repository is committed and pushed right after
+    their fetch, and one summary covers both steps; a failed fetch skips
+    that user's push. Nobody can answer a duplicate prompt for many users
+    at once, so "ask" is treated as "skip".
+    """
+    from .fetch import fetch_submissions
+    from .git_push import git_push
+
+    if on_duplicate == "ask":
+        on_duplicate = "skip"
+
+    def sync_user(username: str):
+        saved = fetch_submissions(username=username, on_duplicate=on_duplicate, **fetch_options)
+        if not push:
+            return saved
+        return saved, git_push(custom_message, username=username)
+
+    def describe(result) -> str:
+        if not push:
+            return f"{result} submissions saved"
+        saved, pushed = result
+        return f"{saved} submissions saved, {'pushed' if pushed else 'nothing to push'}"
+
+    action = "Sync" if push else "Fetch"
+    results = run_for_all_users(action, sync_user, max_parallel)
+    print_summary(action, results, describe)
+
+
+def push_all_users(custom_message: str = None, max_parallel: int = DEFAULT_MAX_PARALLEL):
+    """Commit and push every configured user's repository concurrently"""
+    from .git_push import git_push
+
+    results = run_for_all_users(
+        "Push",
+        lambda username: git_push(custom_message, username=username),
+        max_parallel
+    )
+    print_summary("Push", results, lambda pushed: "pushed" if pushed else "nothing to push")
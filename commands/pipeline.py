@@ -0,0 +1,79 @@
+"""
+Pipeline helpers
+Bounded producer/consumer stages used to stream submissions through fetch
+"""
+
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, Executor, as_completed, wait
+from typing import Callable, Iterable, Iterator
+
+_DONE = object()
+
+
+def prefetch(iterable: Iterable, depth: int = 1) -> Iterator:
+    """
+    Run an iterator in a background thread, staying up to `depth` items ahead
+    Lets the next page download while the current one is being processed.
+    Exceptions raised by the iterator are re-raised in the consumer.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        # Give up once the consumer has gone away, instead of blocking forever
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:
+            put((_DONE, e))
+
+    thread = threading.Thread(target=produce, name="lcsync-prefetch", daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def bounded_map_unordered(executor: Executor, fn: Callable, items: Iterable, max_in_flight: int) -> Iterator:
+    """
+    Apply fn to items on an executor, yielding results as they complete
+    Items are pulled lazily and at most `max_in_flight` calls are pending,
+    so a long input stream never piles up in memory.
+    """
+    pending = set()
+
+    for item in items:
+        pending.add(executor.submit(fn, item))
+
+        if len(pending) >= max_in_flight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        else:
+            # Hand back whatever already finished so results are not held up
+            done = {future for future in pending if future.done()}
+            pending -= done
+
+        for future in done:
+            yield future.result()
+
+    for future in as_completed(pending):
+        yield future.result()
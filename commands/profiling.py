@@ -0,0 +1,174 @@
+"""
+Profiling implementation
+cProfile and tracemalloc captures of one lcsync run, written to a run directory
+"""
+
+import json
+import logging
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# Each profiled run gets its own directory under here
+PROFILE_DIR = Path("cache") / "profiles"
+
+# Stack depth kept per allocation; deeper is more useful and slower
+TRACEMALLOC_FRAMES = 5
+
+# Allocation sites listed per phase in memory.json
+TOP_ALLOCATIONS = 15
+
+# Functions listed in profile.txt
+TOP_FUNCTIONS = 40
+
+# Profiler of the running command, if --profile was given
+_active_profiler = None
+
+
+def mark_phase(name: str):
+    """Record a phase boundary in the active profile; does nothing when not profiling"""
+    profiler = _active_profiler
+    if profiler is not None:
+        profiler.mark(name)
+
+
+class RunProfiler:
+    """
+    Profiles one command run
+
+    cProfile covers the main thread and every thread started while
+    profiling (detail workers, writers, prefetch), merged into one
+    profile.prof for pstats. At each mark() a tracemalloc snapshot is
+    dumped for tracemalloc.Snapshot.load() comparison, together with the
+    current and peak traced memory since the previous mark.
+    """
+
+    def __init__(self, command: str, profile_dir: Path = PROFILE_DIR):
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.run_dir = Path(profile_dir) / f"{timestamp}-{command or 'cli'}"
+        self.command = command
+        self.phases = []
+        self._profiles = []
+        self._lock = threading.Lock()
+        self._start = None
+
+    def _start_thread_profile(self, frame, event, arg):
+        # Installed by threading.setprofile: runs once in each new thread, then
+        # hands the thread over to its own cProfile
+        import cProfile
+
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active (Python 3.12+ profiles all threads at once)
+            return
+        with self._lock:
+            self._profiles.append(profile)
+
+    def start(self):
+        import cProfile
+        import tracemalloc
+
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._start = time.perf_counter()
+
+        profile = cProfile.Profile()
+        self._profiles.append(profile)
+        threading.setprofile(self._start_thread_profile)
+        profile.enable()
+
+    def _top_allocations(self, snapshot) -> List[Dict]:
+        import tracemalloc
+
+        # Skipping entries of the sorted statistics is far cheaper than filter_traces()
+        ignored = {tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>"}
+        top = []
+        for stat in snapshot.statistics("lineno"):
+            frame = stat.traceback[0]
+            if frame.filename in ignored:
+                continue
+            top.append({"location": f"{frame.filename}:{frame.lineno}", "size_bytes": stat.size, "count": stat.count})
+            if len(top) == TOP_ALLOCATIONS:
+                break
+        return top
+
+    def mark(self, name: str):
+        """Dump a tracemalloc snapshot and record memory use for the phase that just ended"""
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            return
+
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            # Start the next phase's peak from here (Python 3.9+)
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+
+            snapshot = tracemalloc.take_snapshot()
+            snapshot_file = f"{len(self.phases) + 1:02d}-{name}.snapshot"
+            snapshot.dump(str(self.run_dir / snapshot_file))
+
+            self.phases.append({
+                "phase": name,
+                "seconds": round(time.perf_counter() - self._start, 3),
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "snapshot": snapshot_file,
+                "top_allocations": self._top_allocations(snapshot),
+            })
+        logging.getLogger().info(f"Profile phase {name}: {current / 1e6:.1f} MB traced, peak {peak / 1e6:.1f} MB")
+
+    def stop(self):
+        """Stop profiling and write profile.prof, profile.txt and memory.json"""
+        import pstats
+        import tracemalloc
+
+        self._profiles[0].disable()
+        threading.setprofile(None)
+
+        self.mark("end")
+        tracemalloc.stop()
+
+        with self._lock:
+            profiles = list(self._profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(str(self.run_dir / "profile.prof"))
+
+        with open(self.run_dir / "profile.txt", 'w', encoding='utf-8') as f:
+            stats.stream = f
+            stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+
+        with open(self.run_dir / "memory.json", 'w', encoding='utf-8') as f:
+            json.dump({
+                "command": self.command,
+                "threads_profiled": len(profiles),
+                "phases": self.phases,
+            }, f, indent=2)
+
+
+def start_profiling(command: str) -> RunProfiler:
+    """Start profiling the current command; mark_phase() records into it until stop_profiling()"""
+    global _active_profiler
+    profiler = RunProfiler(command)
+    profiler.start()
+    _active_profiler = profiler
+    return profiler
+
+
+def stop_profiling() -> Path:
+    """Stop the active profiler and return its run directory"""
+    global _active_profiler
+    profiler, _active_profiler = _active_profiler, None
+    if profiler is None:
+        return None
+    profiler.stop()
+    return profiler.run_dir
@@ -0,0 +1,212 @@
+"""
+LeetCode GraphQL queries
+Request documents and headers shared by the blocking and asyncio API clients
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+LEETCODE_GRAPHQL_URL = "https://leetcode.com/graphql"
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# submissionDetails fields by what they are used for; the field profile picks which are requested
+# Everything written to the solution files
+CODE_DETAIL_FIELDS = """
+        code
+        timestamp
+        statusCode
+        lang {
+            name
+            verboseName
+        }
+"""
+
+# Stats kept in the submission store's columns
+STATS_DETAIL_FIELDS = """        runtimeDisplay
+        runtimePercentile
+        memoryDisplay
+        memoryPercentile
+        notes
+        topicTags {
+            name
+            slug
+        }
+"""
+
+# Everything else LeetCode has; the two distributions alone are several KB per submission
+ANALYTICS_DETAIL_FIELDS = """        runtime
+        runtimeDistribution
+        memory
+        memoryDistribution
+        user {
+            username
+            profile {
+                realName
+                userAvatar
+            }
+        }
+        flagType
+        runtimeError
+        compileError
+        lastTestcase
+"""
+
+# Field profile -> submissionDetails selection (without the question block)
+DETAIL_FIELD_PROFILES = {
+    "minimal": CODE_DETAIL_FIELDS,
+    "standard": CODE_DETAIL_FIELDS + STATS_DETAIL_FIELDS,
+    "full": CODE_DETAIL_FIELDS + STATS_DETAIL_FIELDS + ANALYTICS_DETAIL_FIELDS,
+}
+DEFAULT_DETAIL_PROFILE = "standard"
+
+# Problem info - only needed when the problem catalog cannot provide it
+QUESTION_DETAIL_FIELDS = """        question {
+            questionId
+            titleSlug
+            title
+            translatedTitle
+            difficulty
+        }
+"""
+
+SUBMISSION_DETAIL_QUERY_TEMPLATE = """
+query submissionDetails($submissionId: Int!) {
+    submissionDetails(submissionId: $submissionId) {%s    }
+}
+"""
+
+# Paginated problem list used to build the local problem catalog
+PROBLEM_LIST_QUERY = """
+query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {
+    problemsetQuestionList: questionList(categorySlug: $categorySlug, limit: $limit, skip: $skip, filters: $filters) {
+        total: totalNum
+        questions: data {
+            questionId
+            questionFrontendId
+            title
+            titleSlug
+            difficulty
+            topicTags {
+                name
+                slug
+            }
+        }
+    }
+}
+"""
+
+# GraphQL query - corrected based on LeetCode's actual API
+SUBMISSION_LIST_QUERY = """
+query submissionList($offset: Int!, $limit: Int!, $lastKey: String) {
+    submissionList(offset: $offset, limit: $limit, lastKey: $lastKey) {
+        lastKey
+        hasNext
+        submissions {
+            id
+            title
+            titleSlug
+            status
+            statusDisplay
+            lang
+            runtime
+            timestamp
+            url
+            isPending
+            memory
+            __typename
+        }
+    }
+}
+"""
+
+
+def get_request_headers(cookie: str) -> Dict[str, str]:
+    """Get the HTTP headers sent with every GraphQL request"""
+    return {
+        "Content-Type": "application/json",
+        "User-Agent": USER_AGENT,
+        "Referer": "https://leetcode.com/",
+        "Cookie": f"LEETCODE_SESSION={cookie}",
+    }
+
+
+def get_detail_fields(include_question: bool = True, profile: str = DEFAULT_DETAIL_PROFILE) -> str:
+    """Get the submissionDetails selection of a field profile, with or without the question block"""
+    fields = DETAIL_FIELD_PROFILES[profile]
+    return fields + QUESTION_DETAIL_FIELDS if include_question else fields
+
+
+def build_batch_detail_query(submission_ids: List[str], fields: str) -> Tuple[str, Dict, List[str]]:
+    """
+    Build one GraphQL request looking up many submissions through aliases
+    fields is the submissionDetails selection, as from get_detail_fields
+    Returns the query, its variables and the alias used for each id (in order)
+    """
+    aliases = [f"s{index}" for index in range(len(submission_ids))]
+    declarations = ", ".join(f"$id{index}: Int!" for index in range(len(submission_ids)))
+    selections = "".join(
+        f"    {alias}: submissionDetails(submissionId: $id{index}) {{{fields}    }}\n"
+        for index, alias in enumerate(aliases)
+    )
+    query = f"query submissionDetailsBatch({declarations}) {{\n{selections}}}\n"
+    variables = {f"id{index}": int(submission_id) for index, submission_id in enumerate(submission_ids)}
+    return query, variables, aliases
+
+
+def split_batch_response(response: Dict, submission_ids: List[str], aliases: List[str]) -> Dict:
+    """
+    Split a batched detail response back into one result per submission id
+    Each value is either the submission details or the Exception for that alias,
+    so one bad id never fails the rest of the batch
+    """
+    data = response.get("data") or {}
+    errors_by_alias = {}
+    for error in response.get("errors", []):
+        path = error.get("path") or []
+        alias = path[0] if path else None
+        errors_by_alias.setdefault(alias, []).append(error)
+
+    # Errors without a path (e.g. a rejected query) apply to the whole batch
+    batch_errors = errors_by_alias.get(None)
+
+    results = {}
+    for submission_id, alias in zip(submission_ids, aliases):
+        details = data.get(alias)
+        if details is not None:
+            results[submission_id] = details
+        else:
+            errors = errors_by_alias.get(alias) or batch_errors or "no data returned"
+            results[submission_id] = Exception(f"GraphQL errors: {errors}")
+
+    return results
+
+
+def merge_submission_details(submission: Dict, details: Dict) -> Dict:
+    """Merge the basic submission list entry with its detailed info"""
+    return {
+        **submission,
+        "code": details.get("code", ""),
+        "question": details.get("question", {}),
+        "lang_details": details.get("lang", {}),
+        "details": details
+    }
+
+
+def merge_batch_results(submissions: List[Dict], results: Dict) -> List[Dict]:
+    """
+    Merge the results of a batched detail lookup into their submissions
+    Submissions whose lookup failed keep only their basic info
+    """
+    logger = logging.getLogger()
+    merged_submissions = []
+
+    for submission in submissions:
+        details = results[submission["id"]]
+        if isinstance(details, Exception):
+            logger.warning(f"Failed to get details for submission {submission['id']}: {details}")
+            merged_submissions.append(submission)
+        else:
+            merged_submissions.append(merge_submission_details(submission, details))
+
+    return merged_submissions
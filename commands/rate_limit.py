@@ -0,0 +1,75 @@
+"""
+Rate limiting implementation
+Token bucket shared by every request sent to the LeetCode API
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter
+
+    Tokens refill continuously at `rate` per second up to `burst`.
+    Each request takes one token and waits until it is covered,
+    so bursts of up to `burst` requests go out immediately and the
+    long-run request rate never exceeds `rate`. The same bucket can
+    be shared by threads (acquire) and coroutines (acquire_async).
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("Rate must be greater than zero")
+        if burst < 1:
+            raise ValueError("Burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token, going into debt if none is available
+        Returns the number of seconds the caller must wait before sending
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def defer(self, seconds: float):
+        """Hold every request back until `seconds` from now, e.g. for a 429 with Retry-After"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # The next reserve() then waits `seconds`; later deferrals never shorten an earlier one
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until it is available
+        Returns the number of seconds spent waiting
+        """
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """
+        Take one token without blocking the event loop
+        Returns the number of seconds spent waiting
+        """
+        # Imported here so the threaded fetch path does not pay for asyncio
+        import asyncio
+
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
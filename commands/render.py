@@ -0,0 +1,105 @@
+"""
+Render command implementation
+Rebuild the solutions repository from the local submission store, without the network
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import click
+
+from .manifest import SolutionIndex
+from .profiling import mark_phase
+from .set_user import get_user_config
+from .solutions import DEFAULT_WRITERS, LANGUAGE_EXTENSIONS, get_submission_path, write_submissions
+from .store import SubmissionStore, get_store_path
+
+# Submissions handed to the writer pool at a time
+RENDER_BATCH_SIZE = 200
+
+
+def render_submissions(clean: bool = False, username: str = None):
+    """
+    Re-render leetcodeProblems/ from the submission store
+    Writes the newest stored submission per problem and language;
+    with clean, solution files superseded by a stored submission rendered
+    to another path (e.g. filed under another difficulty) are removed.
+    Files of problems and languages the store has no copy of are always kept.
+    """
+    logger = logging.getLogger()
+
+    try:
+        username, config = get_user_config(username)
+
+        store_path = get_store_path(username)
+        if not store_path.exists():
+            raise click.ClickException(
+                "No submission store found. Please run 'fetch --full --on-duplicate overwrite' once to populate it."
+            )
+
+        github_repo_dir = Path(config["GITHUB_REPO_DIR"])
+        click.echo(f"🎨 Rendering solutions for user: {username}")
+        click.echo(f"📁 Repository: {github_repo_dir}")
+
+        start_time = time.perf_counter()
+        index = SolutionIndex(github_repo_dir, LANGUAGE_EXTENSIONS)
+        rendered_paths = set()
+        rendered_keys = set()
+        saved_count = 0
+
+        with SubmissionStore(store_path) as store, \
+                ThreadPoolExecutor(max_workers=DEFAULT_WRITERS, thread_name_prefix="lcsync-write") as writer:
+            click.echo(f"🗄️  {store.count()} submissions in the local store")
+            batch = []
+
+            # Newest first, so the first submission per file wins
+            for submission in store.iter_submissions():
+                file_path = get_submission_path(submission, github_repo_dir)
+                if file_path is None or file_path in rendered_paths:
+                    continue
+
+                rendered_paths.add(file_path)
+                rendered_keys.add((submission.get("titleSlug", ""), file_path.suffix))
+                batch.append(submission)
+                if len(batch) >= RENDER_BATCH_SIZE:
+                    saved_count += write_submissions(batch, github_repo_dir, writer, overwrite=True, index=index)[0]
+                    batch = []
+
+            saved_count += write_submissions(batch, github_repo_dir, writer, overwrite=True, index=index)[0]
+
+        removed_count = 0
+        unstored_count = 0
+        if clean:
+            for slug, extension, file_path in index.iter_files():
+                if file_path in rendered_paths:
+                    continue
+
+                # Without a stored copy the file may be the only one left: never delete it
+                if (slug, extension) not in rendered_keys:
+                    unstored_count += 1
+                    continue
+
+                file_path.unlink()
+                index.remove(file_path)
+                removed_count += 1
+                logger.info(f"Removed superseded file: {file_path.relative_to(github_repo_dir).as_posix()}")
+
+        index.save()
+        mark_phase("writes")
+
+        elapsed = time.perf_counter() - start_time
+        click.echo(f"✅ Rendered {saved_count} solution files in {elapsed:.2f}s")
+        if clean:
+            click.echo(f"🧹 Removed {removed_count} files superseded by stored submissions")
+            if unstored_count:
+                click.echo(f"ℹ️  Kept {unstored_count} files the store has no copy of; "
+                           f"run 'fetch --full --on-duplicate overwrite' to store them")
+        logger.info(f"Render completed: {saved_count} files written, {removed_count} removed in {elapsed:.2f}s")
+
+    except Exception as e:
+        error_msg = f"Failed to render submissions: {str(e)}"
+        logger.error(error_msg)
+        click.echo(f"❌ {error_msg}", err=True)
+        raise click.ClickException(error_msg)
@@ -0,0 +1,176 @@
+"""
+Retry policy implementation
+Timeouts, exponential backoff with jitter and a circuit breaker for LeetCode API calls
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from .defaults import DEFAULT_MAX_ATTEMPTS, DEFAULT_READ_TIMEOUT
+
+DEFAULT_CONNECT_TIMEOUT = 10.0  # seconds
+
+# HTTP statuses worth retrying: rate limited or server-side trouble
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# HTTP statuses meaning the session cookie is no longer accepted
+AUTH_STATUSES = {401, 403}
+
+# LeetCode answers an expired session with HTTP 200 and one of these in a GraphQL error message
+AUTH_ERROR_MARKERS = ("not authenticated", "not logged in", "login required", "unauthorized")
+
+
+class FatalAPIError(Exception):
+    """An API failure that retrying cannot fix; aborts the whole run"""
+
+
+class AuthError(FatalAPIError):
+    """The LeetCode session cookie was rejected"""
+
+    def __init__(self, message: str = "Session cookie may have expired. Please run 'set_cookie' to update."):
+        super().__init__(message)
+
+
+class CircuitOpenError(FatalAPIError):
+    """Too many consecutive API failures; requests are no longer sent"""
+
+
+class TransientError(Exception):
+    """A failure that may succeed on retry (timeouts, 429, 5xx)"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, status: Optional[int] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status = status
+
+    @property
+    def throttled(self) -> bool:
+        """LeetCode rate limited us and said when to come back; not a sign of failure"""
+        return self.status == 429 and self.retry_after is not None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds to wait"""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def check_status(status: int, retry_after: Optional[str] = None):
+    """Raise AuthError or TransientError for response statuses that need handling"""
+    if status in AUTH_STATUSES:
+        raise AuthError()
+    if status in RETRYABLE_STATUSES:
+        raise TransientError(f"HTTP {status}", parse_retry_after(retry_after), status)
+
+
+def check_graphql_auth(response: Dict, require_data: bool = False):
+    """
+    Raise AuthError for a GraphQL response that says the session is not signed in
+    That is an error message naming authentication or, with require_data,
+    every requested field coming back null without any errors, as the
+    login-required submission list does for an expired cookie. Lookups of
+    single objects leave require_data off, since a deleted or hidden
+    submission is null too
+    """
+    errors = response.get("errors") or []
+    for error in errors:
+        message = str(error.get("message", "") if isinstance(error, dict) else error).lower()
+        if any(marker in message for marker in AUTH_ERROR_MARKERS):
+            raise AuthError()
+
+    data = response.get("data")
+    if require_data and not errors and (data is None or (data and all(value is None for value in data.values()))):
+        raise AuthError()
+
+
+class RetryPolicy:
+    """
+    How API calls are timed out and retried
+
+    Delays grow exponentially from base_delay up to max_delay with full
+    jitter, so concurrent workers do not retry in lockstep. A server
+    supplied Retry-After always wins over the computed delay.
+    """
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS, base_delay: float = 1.0,
+                 max_delay: float = 60.0, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """(connect, read) timeout for a single request"""
+        return (self.connect_timeout, self.read_timeout)
+
+    def compute_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number `attempt` (1 for the first retry)"""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests after sustained failures
+
+    Opens after `failure_threshold` consecutive failed attempts; while
+    open every call fails fast with CircuitOpenError. After
+    `reset_timeout` seconds one trial call is let through, and a success
+    closes the circuit again.
+    """
+
+    def __init__(self, failure_threshold: int = 10, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def check(self):
+        """Raise CircuitOpenError if requests should not be sent right now"""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Half-open: allow a trial request; another failure re-opens
+                self._opened_at = None
+                self._failures = self.failure_threshold - 1
+                return
+        raise CircuitOpenError(
+            f"LeetCode API failed {self.failure_threshold} times in a row; aborting to avoid hammering it"
+        )
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold and self._opened_at is None:
+                self._opened_at = time.monotonic()
@@ -10,13 +10,13 @@ import click
 from .set_user import get_user_config, save_user_config
 
 
-def set_cookie():
+def set_cookie(username=None):
     """Update/change LeetCode session cookie"""
     logger = logging.getLogger()
     
     try:
         # Get user configuration
-        username, config = get_user_config()
+        username, config = get_user_config(username)
         
         click.echo(f"🔑 Updating LeetCode session cookie for user: {username}")
         click.echo()
@@ -6,6 +6,7 @@ One-time user setup for username, GitHub repo, and commit message
 import json
 import logging
 import os
+import sys
 from pathlib import Path
 
 import click
@@ -133,6 +134,11 @@ def get_user_config(username=None):
             actual_username = user_file.stem
         else:
             usernames = [f.stem for f in user_files]
+            if not sys.stdin.isatty():
+                raise click.ClickException(
+                    f"Multiple users found ({', '.join(sorted(usernames))}). "
+                    "Pass --user NAME or --all-users to choose without a prompt."
+                )
             click.echo("Multiple users found:")
             for i, name in enumerate(usernames, 1):
                 click.echo(f"  {i}. {name}")
@@ -150,6 +156,17 @@ def get_user_config(username=None):
     except Exception as e:
         raise click.ClickException(f"Failed to load user configuration: {str(e)}")
 
+def list_usernames():
+    """Get the names of every configured user, sorted"""
+    users_dir = Path.cwd() / "users"
+    if not users_dir.exists():
+        raise click.ClickException("Users directory not found. Please run 'init' command first.")
+    
+    usernames = sorted(f.stem for f in users_dir.glob("*.json"))
+    if not usernames:
+        raise click.ClickException("No user configurations found. Please run 'set_user' command first.")
+    return usernames
+
 def save_user_config(username, config):
     """Save user configuration to file"""
     project_root = Path.cwd()
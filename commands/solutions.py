@@ -0,0 +1,245 @@
+"""
+Solution files implementation
+Render submissions into solution files and write them to the target repository
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .manifest import SolutionIndex, hash_bytes, hash_file
+from .metrics import METRICS
+from .tracing import span
+
+# Language extension mapping
+LANGUAGE_EXTENSIONS = {
+    "python": ".py",
+    "python3": ".py",
+    "javascript": ".js",
+    "java": ".java",
+    "cpp": ".cpp",
+    "c": ".c"
+}
+
+# Threads rendering and writing solution files
+DEFAULT_WRITERS = 8
+
+# save_submission outcomes; None means the file was skipped or could not be written
+SAVE_WRITTEN = "written"
+SAVE_UNCHANGED = "unchanged"
+
+# Difficulty mapping
+DIFFICULTY_FOLDERS = {
+    1: "easy",
+    2: "medium", 
+    3: "hard"
+}
+
+def get_submission_path(submission: Dict, project_root: Path) -> Path:
+    """
+    Get the file a submission is saved to
+    Returns None if the language is not supported or the difficulty is unknown
+    """
+    title_slug = submission.get("titleSlug", "")
+    lang = submission.get("lang", "").lower()
+    
+    # Get file extension
+    extension = LANGUAGE_EXTENSIONS.get(lang)
+    if not extension:
+        return None
+    
+    # Handle different difficulty formats
+    difficulty = submission.get("question", {}).get("difficulty")
+    
+    # Convert difficulty string to number if needed
+    if isinstance(difficulty, str):
+        difficulty_map = {"Easy": 1, "Medium": 2, "Hard": 3}
+        difficulty = difficulty_map.get(difficulty, difficulty)
+    
+    # Unknown difficulty would misfile the problem, so it is not saved
+    difficulty_folder = DIFFICULTY_FOLDERS.get(difficulty)
+    if not difficulty_folder:
+        return None
+    
+    # Create file path
+    filename = f"{title_slug}{extension}"
+    return project_root / "leetcodeProblems" / difficulty_folder / filename
+
+def render_submission(submission: Dict, extension: str) -> bytes:
+    """Render the file content of a submission: header comment followed by the code"""
+    header_comment = get_header_comment(submission, extension)
+    full_content = header_comment + "\n\n" + submission.get("code", "")
+    return full_content.encode('utf-8')
+
+def write_file_atomic(file_path: Path, content: bytes):
+    """
+    Write a file via a temporary file and rename, so an interrupted run
+    never leaves a truncated solution behind
+    """
+    temp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
+
+def save_submission(submission: Dict, project_root: Path, overwrite: bool = False,
+                    index: SolutionIndex = None, create_dirs: bool = True) -> Optional[str]:
+    """
+    Save a submission to the appropriate directory
+    Existing files are only replaced when overwrite is True, and only if
+    the rendered content differs from what is on disk; with an index,
+    existence and content hashes are looked up in it and the written file
+    is recorded there. Pass create_dirs=False when the caller already
+    created the difficulty folders.
+    Returns SAVE_WRITTEN if the file was written, SAVE_UNCHANGED if it
+    already had this content, or None if it was skipped or failed
+    """
+    logger = logging.getLogger()
+    
+    try:
+        # Extract submission data - handle both old and new structure
+        title_slug = submission.get("titleSlug", "")
+        lang = submission.get("lang", "").lower()
+        code = submission.get("code", "")
+        
+        if not all([title_slug, lang, code]):
+            logger.warning(f"Missing required fields for submission: {submission.get('id')}")
+            logger.warning(f"Fields: title_slug={title_slug}, lang={lang}, code={'present' if code else 'missing'}")
+            return None
+        
+        file_path = get_submission_path(submission, project_root)
+        if file_path is None:
+            if lang not in LANGUAGE_EXTENSIONS:
+                logger.warning(f"Unsupported language: {lang}")
+            else:
+                logger.warning(f"Unknown difficulty for {title_slug}, not saving it to avoid misfiling")
+            return None
+        
+        # Check if file already exists
+        if index is not None:
+            exists = (title_slug, file_path.suffix) in index
+        else:
+            exists = file_path.exists()
+        if exists and not overwrite:
+            return None  # Will be handled by duplicate detection
+        
+        with METRICS.timer("render_seconds"):
+            content = render_submission(submission, file_path.suffix)
+        
+        # Leave identical files alone so they do not show up as changes in git
+        if exists:
+            if index is not None:
+                existing_hash = index.get_hash(title_slug, file_path.suffix)
+            else:
+                existing_hash = hash_file(file_path)
+            if existing_hash == hash_bytes(content):
+                logger.debug(f"Unchanged submission: {file_path.relative_to(project_root)}")
+                METRICS.inc("files_unchanged_total")
+                return SAVE_UNCHANGED
+        
+        # Ensure directory exists
+        if create_dirs:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Save file - written as bytes so the manifest hash matches the file exactly
+        with METRICS.timer("file_write_seconds"), span("write file", "io", path=file_path.name):
+            write_file_atomic(file_path, content)
+        METRICS.inc("files_written_total")
+        METRICS.inc("file_write_bytes_total", len(content))
+        
+        if index is not None:
+            index.record(file_path, title_slug, lang, content)
+        
+        logger.info(f"Saved submission: {file_path.relative_to(project_root)}")
+        return SAVE_WRITTEN
+        
+    except Exception as e:
+        logger.error(f"Failed to save submission {submission.get('id')}: {e}")
+        return None
+
+def write_submissions(submissions: List[Dict], project_root: Path, executor: Executor,
+                      overwrite: bool = False, index: SolutionIndex = None) -> Tuple[int, List[str]]:
+    """
+    Render and write a batch of submissions on a writer thread pool
+    Difficulty folders are created once for the whole batch.
+    Returns the number of files written and the ids of the submissions
+    whose file now holds their content (written or already identical)
+    """
+    if not submissions:
+        return 0, []
+    
+    start_time = time.perf_counter()
+    
+    folders = {path.parent for path in (get_submission_path(sub, project_root) for sub in submissions) if path}
+    for folder in folders:
+        folder.mkdir(parents=True, exist_ok=True)
+    
+    results = list(executor.map(
+        lambda submission: save_submission(submission, project_root, overwrite=overwrite,
+                                           index=index, create_dirs=False),
+        submissions
+    ))
+    saved_count = sum(1 for result in results if result == SAVE_WRITTEN)
+    persisted_ids = [submission.get("id") for submission, result in zip(submissions, results) if result is not None]
+    
+    elapsed = time.perf_counter() - start_time
+    METRICS.observe("write_batch_seconds", elapsed)
+    logging.getLogger().info(f"Wrote {saved_count} of {len(submissions)} files in {elapsed * 1000:.1f}ms "
+                             f"({len(submissions) / max(elapsed, 1e-9):.0f} files/s)")
+    return saved_count, persisted_ids
+
+def get_header_comment(submission: Dict, extension: str) -> str:
+    """Generate header comment for the submission file"""
+    title = submission.get("title", "") or submission.get("question", {}).get("title", "")
+    title_slug = submission.get("titleSlug", "")
+    lang = submission.get("lang", "")
+    
+    # Handle difficulty from different possible sources
+    difficulty = submission.get("question", {}).get("difficulty", "")
+    if isinstance(difficulty, int):
+        difficulty_text = DIFFICULTY_FOLDERS.get(difficulty, str(difficulty))
+    else:
+        difficulty_text = difficulty.lower() if difficulty else "unknown"
+    
+    if extension in [".py"]:
+        return f'''"""
+LeetCode Problem: {title}
+Difficulty: {difficulty_text.title()}
+Language: {lang}
+Link: https://leetcode.com/problems/{title_slug}/
+
+Auto-generated by LeetCode Submission Auto GitHub Push
+"""'''
+    elif extension in [".js"]:
+        return f'''/**
+ * LeetCode Problem: {title}
+ * Difficulty: {difficulty_text.title()}
+ * Language: {lang}
+ * Link: https://leetcode.com/problems/{title_slug}/
+ * 
+ * Auto-generated by LeetCode Submission Auto GitHub Push
+ */'''
+    elif extension in [".java", ".cpp", ".c"]:
+        return f'''/**
+ * LeetCode Problem: {title}
+ * Difficulty: {difficulty_text.title()}
+ * Language: {lang}
+ * Link: https://leetcode.com/problems/{title_slug}/
+ * 
+ * Auto-generated by LeetCode Submission Auto GitHub Push
+ */'''
+    else:
+        return f'''// LeetCode Problem: {title}
+// Difficulty: {difficulty_text.title()}
+// Language: {lang}
+// Link: https://leetcode.com/problems/{title_slug}/
+// 
+// Auto-generated by LeetCode Submission Auto GitHub Push'''
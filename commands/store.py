@@ -0,0 +1,162 @@
+"""
+Submission store implementation
+Local SQLite copy of every submission downloaded from LeetCode
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+# Stored as users/<username>.db next to the user's configuration
+STORE_SUFFIX = ".db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    title_slug TEXT NOT NULL,
+    title TEXT,
+    lang TEXT NOT NULL,
+    status TEXT,
+    timestamp INTEGER,
+    question_id TEXT,
+    difficulty TEXT,
+    code TEXT NOT NULL,
+    runtime TEXT,
+    memory TEXT,
+    runtime_percentile REAL,
+    memory_percentile REAL,
+    topic_tags TEXT,
+    notes TEXT,
+    details TEXT,
+    fetched_at TEXT
+);
+CREATE INDEX IF NOT EXISTS submissions_problem ON submissions (title_slug, lang, timestamp);
+"""
+
+
+def get_store_path(username: str) -> Path:
+    """Get the path of the submission store for a user"""
+    return Path.cwd() / "users" / f"{username}{STORE_SUFFIX}"
+
+
+def row_to_submission(row: sqlite3.Row) -> Dict:
+    """A stored row in the same shape as a fetched submission"""
+    return {
+        "id": str(row["id"]),
+        "title": row["title"],
+        "titleSlug": row["title_slug"],
+        "lang": row["lang"],
+        "statusDisplay": row["status"],
+        "timestamp": str(row["timestamp"]),
+        "code": row["code"],
+        "question": {
+            "questionId": row["question_id"],
+            "titleSlug": row["title_slug"],
+            "title": row["title"],
+            "difficulty": row["difficulty"],
+        },
+        "details": json.loads(row["details"] or "{}"),
+    }
+
+
+class SubmissionStore:
+    """
+    SQLite store of downloaded submissions, keyed by submission id
+
+    Keeps everything LeetCode returned (code, runtime, memory, percentiles,
+    topic tags, notes) so the solutions repo can be re-rendered offline.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+    def save_submissions(self, submissions: List[Dict]) -> int:
+        """
+        Insert or update downloaded submissions
+        Submissions without code (failed downloads) are skipped.
+        Returns the number of submissions stored
+        """
+        fetched_at = datetime.now().isoformat(timespec="seconds")
+        rows = []
+
+        for submission in submissions:
+            if not submission.get("code"):
+                continue
+
+            details = submission.get("details", {})
+            question = submission.get("question") or {}
+            rows.append((
+                int(submission["id"]),
+                submission.get("titleSlug") or question.get("titleSlug", ""),
+                submission.get("title") or question.get("title", ""),
+                submission.get("lang", "").lower(),
+                submission.get("statusDisplay"),
+                int(submission.get("timestamp") or 0),
+                question.get("questionId"),
+                question.get("difficulty"),
+                submission["code"],
+                details.get("runtimeDisplay") or submission.get("runtime"),
+                details.get("memoryDisplay") or submission.get("memory"),
+                details.get("runtimePercentile"),
+                details.get("memoryPercentile"),
+                json.dumps(details.get("topicTags") or []),
+                details.get("notes"),
+                json.dumps(details),
+                fetched_at,
+            ))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO submissions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+        logging.getLogger().info(f"Stored {len(rows)} submissions in {self.db_path.name}")
+        return len(rows)
+
+    def count(self) -> int:
+        """Number of submissions in the store"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM submissions").fetchone()[0]
+
+    def iter_submissions(self) -> Iterator[Dict]:
+        """
+        Yield every stored submission, newest first, in the same shape
+        as a fetched submission so it can be saved with save_submission
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM submissions ORDER BY timestamp DESC, id DESC"
+            ).fetchall()
+
+        for row in rows:
+            yield row_to_submission(row)
+
+    def get_submissions(self, submission_ids: List[str]) -> Dict[str, Dict]:
+        """Stored submissions by id; ids that are not in the store are left out"""
+        placeholders = ", ".join("?" for _ in submission_ids)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM submissions WHERE id IN ({placeholders})",
+                [int(submission_id) for submission_id in submission_ids]
+            ).fetchall()
+
+        return {str(row["id"]): row_to_submission(row) for row in rows}
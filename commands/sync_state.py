@@ -0,0 +1,68 @@
+"""
+Sync state implementation
+Persist the incremental sync cursor for each user next to their configuration
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import click
+
+# Stored as users/<username>.sync so it is never mistaken for a user config
+SYNC_STATE_SUFFIX = ".sync"
+
+
+def get_sync_state_path(username: str) -> Path:
+    """Get the path of the sync state file for a user"""
+    return Path.cwd() / "users" / f"{username}{SYNC_STATE_SUFFIX}"
+
+
+def load_sync_state(username: str) -> Dict:
+    """
+    Load the sync state for a user
+    Returns an empty dict if the user has never been synced
+    """
+    logger = logging.getLogger()
+    state_file = get_sync_state_path(username)
+
+    if not state_file.exists():
+        return {}
+
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        # A broken state file only costs a full rescan, never data
+        logger.warning(f"Ignoring unreadable sync state {state_file}: {e}")
+        return {}
+
+
+def save_sync_state(username: str, state: Dict):
+    """Save the sync state for a user"""
+    state_file = get_sync_state_path(username)
+    state = {**state, "updated_at": datetime.now().isoformat(timespec="seconds")}
+
+    try:
+        with open(state_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+    except Exception as e:
+        raise click.ClickException(f"Failed to save sync state: {str(e)}")
+
+
+def trim_synced_submissions(submissions: List[Dict], since_id: int = None) -> Tuple[List[Dict], bool]:
+    """
+    Cut a newest-first page of submissions at the last synced submission
+    Returns the unsynced submissions and whether synced history was reached
+    """
+    if since_id is None:
+        return submissions, False
+
+    for index, submission in enumerate(submissions):
+        if int(submission["id"]) <= since_id:
+            logging.getLogger().info(f"Reached already-synced submission {submission['id']}, stopping pagination")
+            return submissions[:index], True
+
+    return submissions, False
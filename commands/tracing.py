@@ -0,0 +1,121 @@
+"""
+Tracing implementation
+Timeline of HTTP requests, rate-limit waits, retries, file writes and git, exported as Chrome trace events
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict
+
+# Events kept per run; a long watch stops recording instead of growing without bound
+MAX_TRACE_EVENTS = 500000
+
+# Tracer of the running command, if --trace was given
+_active_tracer = None
+
+
+class Tracer:
+    """
+    Collects complete ("X") trace events from any thread
+
+    Timestamps are microseconds since the tracer started, and every
+    thread gets a thread_name metadata event the first time it records,
+    so Perfetto and chrome://tracing show one named track per worker.
+    """
+
+    def __init__(self, process_name: str = "lcsync"):
+        self.process_name = process_name
+        self.events = []
+        self.dropped = 0
+        self._pid = os.getpid()
+        self._named_threads = set()
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def _micros(self, timestamp: float) -> float:
+        return round((timestamp - self._start) * 1e6, 3)
+
+    def add_span(self, name: str, category: str, start: float, end: float, args: Dict = None):
+        """Record a span between two time.perf_counter() readings on the current thread"""
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": self._micros(start),
+            "dur": round((end - start) * 1e6, 3),
+            "pid": self._pid,
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+
+        with self._lock:
+            if len(self.events) >= MAX_TRACE_EVENTS:
+                self.dropped += 1
+                return
+            if thread.ident not in self._named_threads:
+                self._named_threads.add(thread.ident)
+                self.events.append({"name": "thread_name", "ph": "M", "pid": self._pid,
+                                    "tid": thread.ident, "args": {"name": thread.name}})
+            self.events.append(event)
+
+    def export(self, path: Path):
+        """Write everything recorded as a Chrome trace-event JSON file"""
+        with self._lock:
+            events = list(self.events)
+            dropped = self.dropped
+
+        events.insert(0, {"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0,
+                          "args": {"name": self.process_name}})
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "traceEvents": events,
+                "displayTimeUnit": "ms",
+                "otherData": {"dropped_events": dropped},
+            }, f)
+
+
+def add_span(name: str, category: str, start: float, end: float, **args):
+    """Record an already timed span; does nothing when not tracing"""
+    tracer = _active_tracer
+    if tracer is not None:
+        tracer.add_span(name, category, start, end, args)
+
+
+@contextmanager
+def span(name: str, category: str, **args):
+    """Record the body of a with block as a span; does nothing when not tracing"""
+    tracer = _active_tracer
+    if tracer is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.add_span(name, category, start, time.perf_counter(), args)
+
+
+def start_tracing(command: str) -> Tracer:
+    """Start recording spans for the current command until stop_tracing()"""
+    global _active_tracer
+    _active_tracer = Tracer(f"lcsync {command}" if command else "lcsync")
+    return _active_tracer
+
+
+def stop_tracing(path: Path) -> int:
+    """Stop recording, write the trace to path and return the number of events"""
+    global _active_tracer
+    tracer, _active_tracer = _active_tracer, None
+    if tracer is None:
+        return 0
+    tracer.export(path)
+    return len(tracer.events)
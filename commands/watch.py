@@ -0,0 +1,143 @@
+"""
+Watch command implementation
+Long-running sync that polls LeetCode for new submissions and pushes them
+"""
+
+import logging
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import click
+
+from .defaults import (DEFAULT_BATCH_SIZE, DEFAULT_BURST, DEFAULT_MAX_ATTEMPTS,
+                       DEFAULT_MAX_INTERVAL, DEFAULT_MIN_INTERVAL, DEFAULT_RATE,
+                       DEFAULT_READ_TIMEOUT, DEFAULT_WORKERS)
+from .fetch import LeetCodeAPI, fetch_submissions
+from .git_push import git_push
+from .metrics import METRICS
+from .queries import DEFAULT_DETAIL_PROFILE
+from .rate_limit import TokenBucket
+from .retry import AuthError, CircuitOpenError, RetryPolicy
+from .set_user import get_user_config
+
+
+def push_in_background(username: str):
+    """Run git push for a user, logging instead of raising on failure"""
+    try:
+        git_push(username=username)
+    except Exception as e:
+        logging.getLogger().error(f"Background push failed for {username}: {e}")
+
+
+def watch_submissions(username: str = None, min_interval: float = DEFAULT_MIN_INTERVAL,
+                      max_interval: float = DEFAULT_MAX_INTERVAL, push: bool = True,
+                      workers: int = DEFAULT_WORKERS, rate: float = DEFAULT_RATE,
+                      burst: int = DEFAULT_BURST, batch_size: int = DEFAULT_BATCH_SIZE,
+                      retries: int = DEFAULT_MAX_ATTEMPTS - 1, timeout: float = DEFAULT_READ_TIMEOUT,
+                      on_duplicate: str = "skip", detail_profile: str = DEFAULT_DETAIL_PROFILE,
+                      on_cycle: Callable[[], None] = None):
+    """
+    Keep a user's solutions repository in sync until stopped
+    One API session stays open for the whole run. Each poll only asks for
+    the newest submission; when it changed, an incremental fetch runs and
+    the interval drops to min_interval, otherwise it doubles up to
+    max_interval. New files are pushed on a background thread, one push
+    at a time. SIGTERM or Ctrl+C finishes the current sync and push, then exits.
+    on_cycle, if given, is called after every poll (e.g. to refresh metrics).
+    """
+    logger = logging.getLogger()
+
+    try:
+        username, config = get_user_config(username)
+
+        leetcode_cookie = config.get("LEETCODE_COOKIE", "")
+        if not leetcode_cookie:
+            raise click.ClickException("LeetCode cookie not set. Please run 'set_cookie' command first.")
+
+        api = LeetCodeAPI(leetcode_cookie, limiter=TokenBucket(rate, burst),
+                          workers=workers, batch_size=batch_size,
+                          retry_policy=RetryPolicy(max_attempts=retries + 1, read_timeout=timeout),
+                          detail_profile=detail_profile)
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            if stop.is_set():
+                # Second signal: stop waiting for the current sync
+                raise KeyboardInterrupt
+            click.echo("\n🛑 Stopping after the current sync (signal again to abort)...")
+            stop.set()
+
+        previous_handlers = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+
+        click.echo(f"👀 Watching LeetCode submissions for user: {username}")
+        click.echo(f"⏱️  Polling every {min_interval:.0f}s to {max_interval:.0f}s; press Ctrl+C to stop")
+        logger.info(f"Watch started for {username}")
+
+        last_seen_id = None
+        interval = min_interval
+        push_pending = False
+        push_future = None
+
+        try:
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="lcsync-push") as pusher:
+                while not stop.is_set():
+                    try:
+                        METRICS.inc("watch_polls_total")
+                        latest_id = api.get_latest_submission_id()
+
+                        if latest_id != last_seen_id:
+                            if last_seen_id is not None:
+                                click.echo(f"🔔 New submission #{latest_id}, syncing...")
+                            METRICS.inc("watch_syncs_total")
+                            saved_count = fetch_submissions(username=username, on_duplicate=on_duplicate,
+                                                            api=api, resume_hint=False)
+                            last_seen_id = latest_id
+                            interval = min_interval
+                            push_pending = push_pending or (push and saved_count > 0)
+                        else:
+                            interval = min(interval * 2, max_interval)
+                    except Exception as e:
+                        # fetch reports its own failure and chains the original error
+                        reported = isinstance(e, click.ClickException)
+                        error = e.__cause__ if reported and e.__cause__ is not None else e
+
+                        if isinstance(error, AuthError):
+                            raise error
+                        if isinstance(error, CircuitOpenError):
+                            # Wait out the breaker; the next poll is its half-open trial request
+                            logger.warning(f"{error}; pausing polls for {api.breaker.reset_timeout:.0f}s")
+                            interval = max(interval, api.breaker.reset_timeout)
+                        else:
+                            if not reported:
+                                logger.warning(f"Poll failed: {e}")
+                            interval = min(interval * 2, max_interval)
+
+                    # One push at a time; files saved meanwhile go with the next one
+                    if push_pending and (push_future is None or push_future.done()):
+                        push_future = pusher.submit(push_in_background, username)
+                        push_pending = False
+
+                    if on_cycle is not None:
+                        on_cycle()
+                    logger.info(f"Next poll in {interval:.0f}s")
+                    stop.wait(interval)
+
+                if push_pending:
+                    if push_future is not None:
+                        push_future.result()
+                    pusher.submit(push_in_background, username)
+                # Leaving the executor waits for a running push to finish
+        finally:
+            for sig, handler in previous_handlers.items():
+                signal.signal(sig, handler)
+
+        click.echo("👋 Watch stopped")
+        logger.info(f"Watch stopped for {username}")
+
+    except Exception as e:
+        error_msg = f"Watch failed: {str(e)}"
+        logger.error(error_msg)
+        click.echo(f"❌ {error_msg}", err=True)
+        raise click.ClickException(error_msg)
@@ -4,21 +4,32 @@ LeetCode Sync (lcsync) - Simple Command Wrapper
 Short and easy commands for the LeetCode submission tool
 """
 
-import subprocess
+import os
 import sys
 from pathlib import Path
 
 
 def run_command(cmd_args):
-    """Run the main CLI with the provided arguments"""
-    script_dir = Path(__file__).parent
-    main_script = script_dir / "leetcode_auto_push.py"
+    """Run the main CLI in this process with the provided arguments"""
+    script_dir = Path(__file__).resolve().parent
+    
+    # Commands resolve users/ and cache/ relative to the working directory
+    os.chdir(script_dir)
+    if str(script_dir) not in sys.path:
+        sys.path.insert(0, str(script_dir))
+    
+    # Imported only when a command runs, so 'lcsync help' starts instantly
+    import click
+    from leetcode_auto_push import cli
     
     try:
-        result = subprocess.run([sys.executable, str(main_script)] + cmd_args, 
-                              check=False, cwd=script_dir)
-        sys.exit(result.returncode)
-    except KeyboardInterrupt:
+        result = cli.main(args=cmd_args, prog_name="leetcode_auto_push.py", standalone_mode=False)
+        # --help and --version return their exit code; commands return None on success
+        sys.exit(result if isinstance(result, int) else 0)
+    except click.ClickException as e:
+        e.show()
+        sys.exit(e.exit_code)
+    except (click.Abort, KeyboardInterrupt):
         print("\n⚠️  Operation cancelled by user")
         sys.exit(1)
     except Exception as e:
@@ -38,8 +49,14 @@ COMMANDS:
     user        Set up target repository and create LeetCode directory structure
     cookie      Update/change LeetCode session cookie  
     fetch       Fetch new accepted submissions from LeetCode
+    fetch --full Rescan the entire submission history
+    render      Re-render solution files from the local store (no network)
     push        Push changes to GitHub (git add, commit, push)
     push -m"msg" Push with custom commit message
+    watch       Keep fetching and pushing new submissions until stopped
+    --user NAME  Pick the user without a prompt (fetch, render, push, watch, cookie)
+    --all-users  Fetch or push every configured user concurrently
+    fetch --push Fetch, then push (with --all-users: one summary for both)
     help        Show this help message
 
 EXAMPLES:
@@ -47,8 +64,13 @@ EXAMPLES:
     lcsync user                              # Set up your user configuration
     lcsync cookie                            # Add your LeetCode session cookie
     lcsync fetch                             # Fetch your latest submissions
+    lcsync fetch --full                      # Re-check your whole history
+    lcsync render                            # Rebuild files after a layout change
     lcsync push                              # Push with default message
     lcsync push -m"Added new solutions"      # Push with custom message
+    lcsync fetch --all-users --push          # Sync and push every configured user
+    lcsync push --all-users                  # Push every user's repository
+    lcsync watch --min-interval 30           # Sync and push as you solve
 
 FULL WORKFLOW:
     1. lcsync init      # First time setup
@@ -74,7 +96,9 @@ def main():
         'user': ['set-user'],
         'cookie': ['set-cookie'],
         'fetch': ['fetch'],
+        'render': ['render'],
         'push': ['git-push'],
+        'watch': ['watch'],
         'help': ['--help'],
         '-h': ['--help'],
         '--help': ['--help']
@@ -83,17 +107,10 @@ def main():
     if command in command_map:
         if command in ['help', '-h', '--help']:
             show_help()
-        elif command == 'push':
-            # Handle custom commit message for push command
-            args = ['git-push']
-            if len(sys.argv) > 2 and sys.argv[2].startswith('-m'):
-                if sys.argv[2] == '-m' and len(sys.argv) > 3:
-                    # Format: lcsync push -m "message"
-                    args.extend(['-m', sys.argv[3]])
-                elif sys.argv[2].startswith('-m'):
-                    # Format: lcsync push -m"message" 
-                    args.extend([sys.argv[2]])
-            run_command(args)
+        elif command in ['fetch', 'render', 'push', 'watch', 'cookie']:
+            # Pass options (e.g. --full, --clean, -m "msg", --user NAME) straight through;
+            # click also accepts the -m"message" form
+            run_command(command_map[command] + sys.argv[2:])
         else:
             run_command(command_map[command])
     else:
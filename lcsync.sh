@@ -1,4 +1,4 @@
 #!/bin/bash
 # LeetCode Sync - Unix/Linux/Mac wrapper script
 cd "$(dirname "$0")"
-python3 lcsync.py "$@"
\ No newline at end of file
+exec python3 lcsync.py "$@"
\ No newline at end of file
@@ -10,6 +10,11 @@ from pathlib import Path
 
 import click
 
+# Only the import-free defaults module is loaded up front, for the option defaults
+from commands.defaults import (DEFAULT_BATCH_SIZE, DEFAULT_BURST, DEFAULT_MAX_ATTEMPTS,
+                               DEFAULT_MAX_INTERVAL, DEFAULT_MAX_PARALLEL, DEFAULT_MIN_INTERVAL,
+                               DEFAULT_RATE, DEFAULT_READ_TIMEOUT, DEFAULT_WORKERS)
+
 # Commands will be imported within each command function to avoid conflicts
 
 # Set up logging
@@ -21,8 +26,8 @@ def setup_logging():
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
     
-    # File handler
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    # File handler - the log file is only opened once something is logged
+    file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
     file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     file_handler.setFormatter(file_formatter)
     
@@ -37,9 +42,21 @@ def setup_logging():
     
     return logger
 
+def record_run(command):
+    """Collect metrics for a command run; the report is appended to cache/metrics/runs.jsonl"""
+    from commands.metrics import record_run as record_metrics_run
+    prometheus_file = click.get_current_context().find_root().params.get("prometheus_file")
+    return record_metrics_run(command, prometheus_file)
+
 @click.group()
 @click.version_option(version="1.0.0", prog_name="LeetCode Auto Push")
-def cli():
+@click.option('--prometheus-file', type=click.Path(dir_okay=False), envvar='LCSYNC_PROMETHEUS_FILE',
+              help='Also write run metrics to this file in Prometheus textfile format')
+@click.option('--profile', is_flag=True, envvar='LCSYNC_PROFILE', help='Profile the command (cProfile and tracemalloc) into cache/profiles/')
+@click.option('--trace', 'trace_file', type=click.Path(dir_okay=False), envvar='LCSYNC_TRACE',
+              help='Write a Chrome trace (Perfetto, chrome://tracing) of requests, waits, writes and git to this file')
+@click.pass_context
+def cli(ctx, prometheus_file, profile, trace_file):
     """
     LeetCode Submission Auto GitHub Push CLI
     
@@ -47,6 +64,27 @@ def cli():
     then optionally push them to GitHub.
     """
     setup_logging()
+    
+    if profile:
+        from commands.profiling import start_profiling, stop_profiling
+        
+        def write_profile():
+            run_dir = stop_profiling()
+            if run_dir is not None:
+                click.echo(f"🔬 Profile written to {run_dir}", err=True)
+        
+        start_profiling(ctx.invoked_subcommand)
+        ctx.call_on_close(write_profile)
+    
+    if trace_file:
+        from commands.tracing import start_tracing, stop_tracing
+        
+        def write_trace():
+            event_count = stop_tracing(trace_file)
+            click.echo(f"🧵 Trace with {event_count} events written to {trace_file} (open in https://ui.perfetto.dev)", err=True)
+        
+        start_tracing(ctx.invoked_subcommand)
+        ctx.call_on_close(write_trace)
 
 @cli.command()
 def init():
@@ -61,23 +99,118 @@ def set_user():
     set_user_func()
 
 @cli.command()
-def set_cookie():
+@click.option('--user', 'username', help='User to update (skips the selection prompt)')
+def set_cookie(username):
     """Update/change LeetCode session cookie"""
     from commands.set_cookie import set_cookie as set_cookie_func
-    set_cookie_func()
+    set_cookie_func(username)
 
 @cli.command()
-def fetch():
+@click.option('--full', is_flag=True, help='Rescan the entire submission history instead of stopping at the last synced submission')
+@click.option('--workers', type=click.IntRange(min=1), default=DEFAULT_WORKERS, show_default=True, help='Concurrent submission detail requests')
+@click.option('--rate', type=click.FloatRange(min=0, min_open=True), default=DEFAULT_RATE, show_default=True, help='Maximum API requests per second')
+@click.option('--burst', type=click.IntRange(min=1), default=DEFAULT_BURST, show_default=True, help='Maximum API requests sent back-to-back')
+@click.option('--batch-size', type=click.IntRange(min=1), default=DEFAULT_BATCH_SIZE, show_default=True, help='Submission details looked up per API request')
+@click.option('--refresh-catalog', is_flag=True, help='Rebuild the cached problem catalog before fetching')
+@click.option('--retries', type=click.IntRange(min=0), default=DEFAULT_MAX_ATTEMPTS - 1, show_default=True, help='Retries per API request on timeouts, 429 and 5xx')
+@click.option('--timeout', type=click.FloatRange(min=0, min_open=True), default=DEFAULT_READ_TIMEOUT, show_default=True, help='Read timeout per API request in seconds')
+@click.option('--on-duplicate', type=click.Choice(['ask', 'skip', 'overwrite']), default='ask', show_default=True,
+              help='What to do with submissions already saved: prompt, keep existing files, or rewrite changed ones')
+@click.option('--backfill', is_flag=True, help='Import solutions straight into git history with git fast-import')
+@click.option('--commit-per-problem', is_flag=True, help='With --backfill, make one commit per problem dated with its submission time')
+@click.option('--fields', 'detail_profile', type=click.Choice(['minimal', 'standard', 'full']), default='standard', show_default=True,
+              help='Submission detail fields to download: code only, plus runtime/memory stats, or everything incl. distributions')
+@click.option('--resume', is_flag=True, help='Continue an interrupted fetch without repeating the requests it completed')
+@click.option('--push', is_flag=True, help='Commit and push the repository after fetching')
+@click.option('-m', '--message', help='With --push, custom commit message')
+@click.option('--user', 'username', help='User to fetch for (skips the selection prompt)')
+@click.option('--all-users', is_flag=True, help='Fetch for every configured user concurrently')
+@click.option('--max-parallel', type=click.IntRange(min=1), default=DEFAULT_MAX_PARALLEL, show_default=True, help='With --all-users, users fetched at the same time')
+def fetch(full, workers, rate, burst, batch_size, refresh_catalog, retries, timeout, on_duplicate,
+          backfill, commit_per_problem, detail_profile, resume, push, message, username, all_users, max_parallel):
     """Fetch new accepted submissions from LeetCode"""
-    from commands.fetch import fetch_submissions
-    fetch_submissions()
+    # A resumed fetch takes --backfill and --commit-per-problem from its journal
+    if commit_per_problem and not backfill and not resume:
+        raise click.UsageError("--commit-per-problem requires --backfill")
+    if username and all_users:
+        raise click.UsageError("--user and --all-users cannot be combined")
+    if message and not push:
+        raise click.UsageError("--message requires --push")
+    
+    options = dict(full=full, workers=workers, rate=rate, burst=burst,
+                   batch_size=batch_size, refresh_catalog=refresh_catalog,
+                   retries=retries, timeout=timeout, on_duplicate=on_duplicate,
+                   backfill=backfill, commit_per_problem=commit_per_problem, resume=resume,
+                   detail_profile=detail_profile)
+    with record_run("fetch"):
+        if all_users:
+            from commands.multi_user import fetch_all_users
+            fetch_all_users(max_parallel=max_parallel, push=push, custom_message=message, **options)
+        else:
+            from commands.fetch import fetch_submissions
+            if push:
+                # Pick the user once for both steps
+                from commands.set_user import get_user_config
+                username, _ = get_user_config(username)
+            fetch_submissions(username=username, **options)
+            if push:
+                from commands.git_push import git_push as git_push_func
+                git_push_func(message, username=username)
+
+@cli.command()
+@click.option('--clean', is_flag=True, help='Remove solution files that are not in the local store')
+@click.option('--user', 'username', help='User to render for (skips the selection prompt)')
+def render(clean, username):
+    """Re-render solution files from the local submission store (no network)"""
+    from commands.render import render_submissions
+    with record_run("render"):
+        render_submissions(clean=clean, username=username)
 
 @cli.command()
 @click.option('-m', '--message', help='Custom commit message')
-def git_push(message):
+@click.option('--user', 'username', help='User whose repository to push (skips the selection prompt)')
+@click.option('--all-users', is_flag=True, help="Push every configured user's repository concurrently")
+@click.option('--max-parallel', type=click.IntRange(min=1), default=DEFAULT_MAX_PARALLEL, show_default=True, help='With --all-users, repositories pushed at the same time')
+def git_push(message, username, all_users, max_parallel):
     """Bundle git add, commit, push operations"""
-    from commands.git_push import git_push as git_push_func
-    git_push_func(message)
+    if username and all_users:
+        raise click.UsageError("--user and --all-users cannot be combined")
+    
+    with record_run("git-push"):
+        if all_users:
+            from commands.multi_user import push_all_users
+            push_all_users(message, max_parallel=max_parallel)
+        else:
+            from commands.git_push import git_push as git_push_func
+            git_push_func(message, username=username)
+
+@cli.command()
+@click.option('--user', 'username', help='User to watch for (skips the selection prompt)')
+@click.option('--min-interval', type=click.FloatRange(min=1), default=DEFAULT_MIN_INTERVAL, show_default=True, help='Seconds between polls right after new activity')
+@click.option('--max-interval', type=click.FloatRange(min=1), default=DEFAULT_MAX_INTERVAL, show_default=True, help='Longest wait between polls while idle')
+@click.option('--no-push', is_flag=True, help='Only fetch new submissions, do not push them')
+@click.option('--workers', type=click.IntRange(min=1), default=DEFAULT_WORKERS, show_default=True, help='Concurrent submission detail requests')
+@click.option('--rate', type=click.FloatRange(min=0, min_open=True), default=DEFAULT_RATE, show_default=True, help='Maximum API requests per second')
+@click.option('--burst', type=click.IntRange(min=1), default=DEFAULT_BURST, show_default=True, help='Maximum API requests sent back-to-back')
+@click.option('--batch-size', type=click.IntRange(min=1), default=DEFAULT_BATCH_SIZE, show_default=True, help='Submission details looked up per API request')
+@click.option('--retries', type=click.IntRange(min=0), default=DEFAULT_MAX_ATTEMPTS - 1, show_default=True, help='Retries per API request on timeouts, 429 and 5xx')
+@click.option('--timeout', type=click.FloatRange(min=0, min_open=True), default=DEFAULT_READ_TIMEOUT, show_default=True, help='Read timeout per API request in seconds')
+@click.option('--on-duplicate', type=click.Choice(['skip', 'overwrite']), default='skip', show_default=True,
+              help='What to do with submissions already saved: keep existing files, or rewrite changed ones')
+@click.option('--fields', 'detail_profile', type=click.Choice(['minimal', 'standard', 'full']), default='standard', show_default=True,
+              help='Submission detail fields to download: code only, plus runtime/memory stats, or everything incl. distributions')
+def watch(username, min_interval, max_interval, no_push, workers, rate, burst, batch_size, retries, timeout, on_duplicate,
+          detail_profile):
+    """Keep syncing new submissions and push them until stopped"""
+    if min_interval > max_interval:
+        raise click.UsageError("--min-interval cannot be larger than --max-interval")
+    
+    from commands.watch import watch_submissions
+    with record_run("watch") as run:
+        watch_submissions(username=username, min_interval=min_interval, max_interval=max_interval,
+                          push=not no_push, workers=workers, rate=rate, burst=burst,
+                          batch_size=batch_size, retries=retries, timeout=timeout,
+                          on_duplicate=on_duplicate, detail_profile=detail_profile, on_cycle=run.checkpoint)
 
 if __name__ == "__main__":
     cli()
\ No newline at end of file